@@ -1,26 +1,37 @@
+import logging
 import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
+# Load environment variables from .env (before Config reads them)
+load_dotenv()
 from config import Config  # <-- ADD THIS
+from utils.db_pool import build_engine_options
+from utils.db_routing import REPLICA_BIND, init_db_routing
 from flask_cors import CORS
-# Load environment variables from .env
-load_dotenv()
 
 from models import db
-migrate = Migrate()
 jwt = JWTManager()  # Initialize JWT manager
+logger = logging.getLogger("itemhub.app")
 
 def create_app():
     """Factory function to create and configure the Flask app."""
     app = Flask(__name__)
     app.config.from_object(Config)  # <-- ADD THIS LINE
 
+    from utils.logging_setup import init_logging
+    init_logging(app)
+
     # App Config which ovverids the file
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(app.config)
+    if app.config.get("DATABASE_REPLICA_URL"):
+        replica_url = app.config["DATABASE_REPLICA_URL"]
+        app.config["SQLALCHEMY_BINDS"] = {
+            REPLICA_BIND: {"url": replica_url, **build_engine_options(app.config, replica_url)}
+        }
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
     app.config["JWT_SECRET_KEY"] = os.getenv("JWT_SECRET_KEY", "jwt_dev_secret")
     app.config["JWT_TOKEN_LOCATION"] = ["cookies"]
@@ -39,19 +50,57 @@ def create_app():
     )
     # Initialize extensions
     db.init_app(app)
-    migrate.init_app(app, db)
+    if app.config["MIGRATE_ENABLED"]:
+        # Flask-Migrate imports alembic (~150 ms); only `flask db` needs it
+        from flask_migrate import Migrate
+        Migrate(app, db)
     jwt.init_app(app)  # ✅ initialize JWT with the app
+    init_db_routing(app)
+
+    from utils.metrics import init_metrics
+    init_metrics(app)  # first: its after_request runs last
+
+    from utils.request_timing import init_request_timing
+    init_request_timing(app)
+
+    from utils.slow_queries import init_slow_query_log
+    init_slow_query_log(app)
+
+    from utils.profiler import init_profiler
+    init_profiler(app)
+
+    from utils.compression import init_compression
+    init_compression(app)
+
+    from utils.identity import init_identity_cache
+    init_identity_cache(app)
+
+    from utils.passwords import init_password_hasher
+    init_password_hasher(app)
+
+    from utils.categories import init_category_counts
+    init_category_counts(app)
+
+    from utils.facets import init_facet_cache
+    init_facet_cache(app)
+
+    from utils.home_feed import init_home_feed
+    init_home_feed(app)
 
     from routes.auth_routes import auth_bp
     from routes.item_routes import item_bp
     from routes.offer_routes import offer_bp
     from routes.location_routes import location_bp
+    from routes.health_routes import health_bp
+    from routes.metrics_routes import metrics_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(item_bp, url_prefix="/api/items")
     app.register_blueprint(offer_bp, url_prefix="/api/offers")
     app.register_blueprint(location_bp, url_prefix="/api/locations")
-    print("Registered blueprints.")
+    app.register_blueprint(health_bp, url_prefix="/api/health")
+    app.register_blueprint(metrics_bp)
+    logger.info("registered blueprints", extra={"blueprints": sorted(app.blueprints)})
     from commands import init_app as init_commands
     init_commands(app)
     return app
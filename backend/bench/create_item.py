@@ -0,0 +1,65 @@
+"""
+Per-request latency of POST /api/items/ (item + images), in-process.
+
+    DATABASE_URL=postgresql://... python -m bench.create_item --n 300 --images 3
+
+Uses the Flask test client, so the numbers are the route + database cost
+without network or gunicorn overhead. Images are tiny in-memory files
+written to a temporary UPLOAD_FOLDER.
+"""
+import argparse
+import io
+import json
+import tempfile
+import time
+import uuid
+
+from bench.stats import summarize
+
+
+def run(n: int, images: int) -> dict:
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    app.config["UPLOAD_FOLDER"] = tempfile.mkdtemp(prefix="bench-uploads-")
+    with app.app_context():
+        db.create_all()
+
+    client = app.test_client()
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    client.post("/api/auth/register", json={"username": username, "email": f"{username}@bench.local", "password": "bench123"})
+    client.post("/api/auth/login", json={"username": username, "password": "bench123"})
+
+    def create():
+        data = {
+            "title": "Bench item", "category": "Outros", "duration_days": "7",
+            "state": "São Paulo", "city": "Campinas", "offer_type": "free",
+            "images": [(io.BytesIO(b"\xff\xd8bench"), f"bench{i}.jpg") for i in range(images)],
+        }
+        resp = client.post("/api/items/", data=data, content_type="multipart/form-data")
+        return resp.status_code == 201
+
+    for _ in range(min(20, n)):  # warm-up: connections, caches
+        create()
+
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        ok = create()
+        latencies.append(time.perf_counter() - t0)
+        errors += 0 if ok else 1
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=300)
+    parser.add_argument("--images", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.n, args.images), indent=2))
+
+
+if __name__ == "__main__":
+    main()
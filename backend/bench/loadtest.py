@@ -0,0 +1,138 @@
+"""
+Closed-loop HTTP load generator and sync-vs-gthread comparison.
+
+    # against a running server
+    python -m bench.loadtest run --url http://127.0.0.1:5887 --paths /api/items/,/api/locations/states
+
+    # starts gunicorn once per worker class (same workers/DB) and prints a table
+    python -m bench.loadtest compare --classes sync,gthread --workers 4 --threads 4
+
+Only the standard library is used, so it runs inside the backend image.
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bench.stats import summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_load(base_url: str, paths, concurrency: int, duration: float) -> dict:
+    """`concurrency` clients, each issuing requests back to back for `duration` seconds."""
+    target = urlsplit(base_url)
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def client(offset: int):
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+        local, local_errors, i = [], 0, offset
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 500:
+                    local_errors += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+                continue
+            local.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, time.perf_counter() - started, errors[0])
+
+
+def _wait_for_port(host: str, port: int, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not start listening on {host}:{port}")
+
+
+def run_gunicorn(worker_class: str, args) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "GUNICORN_BIND": f"127.0.0.1:{args.port}",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "GUNICORN_WORKERS": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+        "GUNICORN_ACCESSLOG": "/dev/null",
+        "SCHEDULER_ENABLED": "0",
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:create_app()"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port("127.0.0.1", args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        run_load(base_url, args.paths, args.concurrency, args.warmup)
+        return run_load(base_url, args.paths, args.concurrency, args.duration)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--paths", default="/api/items/,/api/locations/states",
+                        type=lambda s: [p for p in s.split(",") if p])
+    common.add_argument("--concurrency", type=int, default=32)
+    common.add_argument("--duration", type=float, default=20, help="seconds measured")
+
+    run = sub.add_parser("run", parents=[common], help="load a running server")
+    run.add_argument("--url", default="http://127.0.0.1:5887")
+
+    compare = sub.add_parser("compare", parents=[common], help="compare gunicorn worker classes")
+    compare.add_argument("--classes", default="sync,gthread", type=lambda s: s.split(","))
+    compare.add_argument("--workers", type=int, default=4)
+    compare.add_argument("--threads", type=int, default=4)
+    compare.add_argument("--port", type=int, default=5899)
+    compare.add_argument("--warmup", type=float, default=3)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        print(json.dumps(run_load(args.url, args.paths, args.concurrency, args.duration), indent=2))
+        return
+
+    print(f"{'worker class':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for worker_class in args.classes:
+        r = run_gunicorn(worker_class, args)
+        print(f"{worker_class:<14}{r['throughput_rps']:>10}{r['p50_ms']:>10}"
+              f"{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Startup-time report: how long `from app import create_app; create_app()`
+takes in a fresh interpreter, and which imports that time goes to.
+
+    python -m bench.startup                      # what every `flask ...` command pays
+    python -m bench.startup --server             # what a gunicorn worker pays (no Flask-Migrate)
+    python -m bench.startup --budget-ms 450      # exit 1 when the median is above the budget
+
+Times --runs fresh interpreters (default 5) for the median wall time of
+import + create_app, then one more under `python -X importtime` (which
+slows imports down) for the slowest project modules and third-party
+packages (cumulative, i.e. including what they import first).
+Under gunicorn with preload (see gunicorn.conf.py) this is paid once by the
+master; without preload, once per worker.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_PACKAGES = {"app", "config", "models", "commands", "seed", "seed_scale", "routes", "utils", "data", "scheduler"}
+
+SNIPPET = """
+import time
+started = time.perf_counter()
+from app import create_app
+create_app()
+print("create_app_ms=%.2f" % ((time.perf_counter() - started) * 1000))
+"""
+
+
+def parse_importtime(stderr: str):
+    """[(module, self_us, cumulative_us, depth)] in import order."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(env, importtime=False):
+    """(wall ms of import + create_app, importtime rows or None)."""
+    flags = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", SNIPPET],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        sys.exit(result.stderr[-2000:])
+    wall_ms = next(
+        float(line.split("=", 1)[1]) for line in result.stdout.splitlines() if line.startswith("create_app_ms=")
+    )
+    return wall_ms, parse_importtime(result.stderr) if importtime else None
+
+
+def print_report(wall_times, rows, top):
+    print(f"import + create_app: median {statistics.median(wall_times):.1f} ms "
+          f"(min {min(wall_times):.1f}, max {max(wall_times):.1f}, {len(wall_times)} runs)")
+    app_row = next((r for r in rows if r[0] == "app"), None)
+    if app_row:
+        print(f"  under -X importtime: `import app` {app_row[2] / 1000:.1f} ms, {len(rows)} modules loaded\n")
+
+    project = [r for r in rows if r[0].split(".")[0] in PROJECT_PACKAGES]
+    third_party = [r for r in rows if r[0].split(".")[0] not in PROJECT_PACKAGES and "." not in r[0]
+                   and not r[0].startswith("_")]
+
+    for title, selected in (("project modules", project), ("third-party / stdlib packages", third_party)):
+        print(f"{title} (cumulative ms, self ms)")
+        for name, self_us, cumulative_us, _ in sorted(selected, key=lambda r: -r[2])[:top]:
+            print(f"  {cumulative_us / 1000:8.1f} {self_us / 1000:8.1f}  {name}")
+        print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--server", action="store_true", help="environment of a gunicorn worker")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail above this median")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")  # create_app needs one, nothing connects
+    if args.server:
+        env.setdefault("MIGRATE_ENABLED", "0")  # as set by gunicorn.conf.py
+
+    wall_times = [measure(env)[0] for _ in range(args.runs)]
+    _, rows = measure(env, importtime=True)
+    print_report(wall_times, rows, args.top)
+
+    median = statistics.median(wall_times)
+    if args.budget_ms is not None:
+        if median > args.budget_ms:
+            print(f"OVER BUDGET: {median:.1f} ms > {args.budget_ms:.1f} ms")
+            return 1
+        print(f"within budget: {median:.1f} ms <= {args.budget_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+Endpoint benchmark suite over a large seeded database (in-process).
+
+    # seeds up to the requested size on first use, then measures every scenario
+    DATABASE_URL=postgresql://... python -m bench.suite --items 200000 --users 20000 --offers 600000
+
+    # store the current numbers, later runs fail (exit 1) on regressions
+    python -m bench.suite --save-baseline
+    python -m bench.suite --tolerance 0.25
+
+Uses the Flask test client, so numbers are route + database cost without
+network or gunicorn overhead. Works on Postgres and SQLite (DATABASE_URL
+defaults to the SQLite file from config.py). Writes are made by a throwaway
+user and removed at the end, so repeated runs measure the same dataset;
+still, point it at a disposable database.
+
+Per scenario it reports p50/p95/p99 latency, throughput and SQL statements
+per request. A regression is a p50 or p95 above baseline * (1 + tolerance)
+(with `--min-delta-ms` of slack for very fast scenarios) or more queries
+per request than the baseline.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from bench.stats import summarize
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+SEED_PASSWORD = "123456"
+
+
+class QueryCounter:
+    """Counts SQL statements sent on any engine (primary and replica)."""
+
+    def __init__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+# -----------------------------------------
+# Dataset
+# -----------------------------------------
+
+def ensure_dataset(app, users: int, items: int, offers: int, seed: int, workers: int):
+    """Seeds (scale mode) until the database holds at least `items` items."""
+    from models import db, Item
+    from seed_scale import seed_at_scale
+
+    with app.app_context():
+        db.create_all()
+        existing = db.session.query(Item.id).count()
+        if existing >= items:
+            print(f"Dataset: {existing} itens já presentes, seed ignorado.")
+            return
+        missing = items - existing
+        seed_at_scale(
+            db, users=users, items=missing, offers=offers * missing // items,
+            seed=seed, workers=workers, log=lambda msg: None,
+        )
+        print(f"Dataset: {missing} itens gerados (total {items}).")
+
+
+def _login(app, username, password=SEED_PASSWORD):
+    client = app.test_client()
+    resp = client.post("/api/auth/login", json={"username": username, "password": password})
+    if resp.status_code != 200:
+        raise SystemExit(f"login as {username!r} failed ({resp.status_code}); was the dataset seeded by flask seed --users?")
+    return client
+
+
+def _fresh_user(app):
+    client = app.test_client()
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    client.post("/api/auth/register", json={"username": username, "email": f"{username}@bench.local", "password": SEED_PASSWORD})
+    client.post("/api/auth/login", json={"username": username, "password": SEED_PASSWORD})
+    return client, username
+
+
+# -----------------------------------------
+# Scenarios
+# -----------------------------------------
+
+def build_scenarios(app, creator, creator_name: str, iterations: int, rng: random.Random):
+    """[(name, call)] where call(i) performs one request and returns True on success."""
+    from sqlalchemy import func
+    from data.categories import ITEM_CATEGORIES
+    from models import db, Item, Offer, User
+
+    with app.app_context():
+        min_id, max_id = db.session.query(func.min(Item.id), func.max(Item.id)).one()
+        busiest = (
+            db.session.query(Offer.user_id)
+            .group_by(Offer.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+            .scalar()
+        )
+        bidder_name = db.session.get(User, busiest).username if busiest else None
+        active_items = db.session.query(Item.id).filter(Item.is_valid).count()
+
+    anonymous = app.test_client()
+    deep_page = max(1, min(active_items // 20, 250))
+    states_cities = [("Minas Gerais", "Belo Horizonte"), ("São Paulo", "Campinas"), ("Bahia", "Salvador")]
+
+    def get(client, url):
+        return client.get(url).status_code == 200
+
+    scenarios = [
+        ("list_items:recent", lambda i: get(anonymous, "/api/items/")),
+        ("list_items:deep_page", lambda i: get(anonymous, f"/api/items/?page={deep_page - i % 5}")),
+        ("list_items:category", lambda i: get(anonymous, f"/api/items/?categories={rng.choice(ITEM_CATEGORIES)}")),
+        ("list_items:state_city", lambda i: get(
+            anonymous, "/api/items/?states={}&cities={}".format(*states_cities[i % len(states_cities)]))),
+        ("list_items:search", lambda i: get(anonymous, "/api/items/?search=iphone")),
+        ("list_items:most_offers", lambda i: get(anonymous, "/api/items/?sort=offers&min_offers=1")),
+        ("list_items:best_price", lambda i: get(anonymous, "/api/items/?sort=best_price&offer_type=pay")),
+        ("get_item", lambda i: get(anonymous, f"/api/items/{rng.randint(min_id, max_id)}")),
+        ("item_categories", lambda i: get(anonymous, "/api/items/categories")),
+        ("item_facets", lambda i: get(anonymous, f"/api/items/facets?categories={rng.choice(ITEM_CATEGORIES)}")),
+    ]
+
+    if bidder_name:
+        bidder = _login(app, bidder_name)
+        cursor = {"next": None}
+
+        def my_offers(i):
+            url = "/api/offers/my"
+            if cursor["next"]:
+                url += f"?cursor={cursor['next']}"
+            resp = bidder.get(url)
+            cursor["next"] = (resp.get_json() or {}).get("next_cursor")
+            return resp.status_code == 200
+
+        scenarios.append(("get_my_offers", my_offers))
+
+    def create_item(i):
+        data = {
+            "title": "Bench item", "category": "Outros", "duration_days": "7",
+            "state": "São Paulo", "city": "Campinas", "offer_type": "free",
+            "images": [(io.BytesIO(b"\xff\xd8bench"), f"bench{n}.jpg") for n in range(3)],
+        }
+        return creator.post("/api/items/", data=data, content_type="multipart/form-data").status_code == 201
+
+    scenarios.append(("create_item", create_item))
+
+    # one fresh item per offer, owned by someone else, still open
+    with app.app_context():
+        targets = [
+            (item_id, offer_type) for item_id, offer_type in
+            db.session.query(Item.id, Item.offer_type)
+            .filter(Item.is_valid, Item.owner_username != creator_name)
+            .order_by(Item.id.desc())
+            .limit(iterations * 2)
+        ]
+
+    def create_offer(i):
+        item_id, offer_type = targets[i % len(targets)]
+        price = {"pay": 100.0, "paid_to_take": -100.0}.get(offer_type, 0.0)
+        resp = creator.post("/api/offers/", json={"item_id": item_id, "price": price, "message": "bench"})
+        return resp.status_code in (200, 201)
+
+    if targets:
+        scenarios.append(("create_offer", create_offer))
+
+    return scenarios
+
+
+def run_scenario(call, iterations: int, warmup: int, counter: QueryCounter) -> dict:
+    for i in range(warmup):
+        call(i)
+
+    latencies, errors = [], 0
+    queries_before = counter.count
+    started = time.perf_counter()
+    for i in range(warmup, warmup + iterations):
+        t0 = time.perf_counter()
+        ok = call(i)
+        latencies.append(time.perf_counter() - t0)
+        errors += 0 if ok else 1
+    result = summarize(latencies, time.perf_counter() - started, errors)
+    result["queries_per_request"] = round((counter.count - queries_before) / max(1, iterations), 1)
+    return result
+
+
+def run_expiration(app, owner_name: str, passes: int, batch: int, counter: QueryCounter) -> dict:
+    """
+    Times `check_expired_offers` over `batch` already-expired items per pass,
+    inserted (untimed) for the bench user; half of them carry one live offer.
+    Items the dataset itself has let expire are processed once, untimed.
+    """
+    from sqlalchemy import insert
+    from data.categories import CATEGORY_IDS
+    from models import db, Item, Offer, User
+    from scheduler.offer_expiration_checker import check_expired_offers
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        check_expired_offers(app)
+
+    with app.app_context():
+        owner = User.get_by_username(owner_name)
+        bidder = db.session.query(User).filter(User.id != owner.id).first()
+        owner_id, bidder_id, bidder_name = owner.id, bidder.id, bidder.username
+
+    latencies, queries = [], 0
+    for _ in range(passes):
+        with app.app_context():
+            created_at = datetime.utcnow() - timedelta(days=2)
+            ids = db.session.scalars(insert(Item).returning(Item.id, sort_by_parameter_order=True), [
+                {
+                    "owner_id": owner_id, "owner_username": owner_name, "title": "Bench expiring",
+                    "category": "Outros", "category_id": CATEGORY_IDS["Outros"], "offer_type": "pay",
+                    "duration_days": 1, "status": "ativo", "created_at": created_at,
+                    "offer_count": n % 2, "best_price": 10.0 if n % 2 else None,
+                }
+                for n in range(batch)
+            ]).all()
+            db.session.execute(insert(Offer), [
+                {"user_id": bidder_id, "user_name": bidder_name, "item_id": item_id, "price": 10.0,
+                 "status": "ativo", "created_at": created_at}
+                for n, item_id in enumerate(ids) if n % 2
+            ])
+            db.session.commit()
+
+        before = counter.count
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            check_expired_offers(app)
+        latencies.append(time.perf_counter() - t0)
+        queries += counter.count - before
+
+    result = summarize(latencies, sum(latencies))
+    result["queries_per_request"] = round(queries / max(1, passes), 1)
+    result["items_per_pass"] = batch
+    return result
+
+
+def cleanup(app, owner_name: str):
+    """Removes everything the bench user created so later runs see the same data."""
+    from sqlalchemy import delete, or_, select, update
+    from models import db, Item, ItemImage, Offer, User
+
+    with app.app_context():
+        owner = User.get_by_username(owner_name)
+        if owner is None:
+            return
+        own_items = select(Item.id).where(Item.owner_id == owner.id)
+        touched = db.session.scalars(
+            select(Offer.item_id).where(Offer.user_id == owner.id, Offer.item_id.not_in(own_items)).distinct()
+        ).all()
+
+        db.session.execute(delete(Offer).where(or_(Offer.user_id == owner.id, Offer.item_id.in_(own_items))))
+        db.session.execute(delete(ItemImage).where(ItemImage.item_id.in_(own_items)))
+        db.session.execute(delete(Item).where(Item.owner_id == owner.id))
+        if touched:
+            db.session.execute(
+                update(Item).where(Item.id.in_(touched)).values(
+                    offer_count=Item.offer_count_subquery(Item.id),
+                    best_price=Item.best_price_subquery(Item.id),
+                )
+            )
+        db.session.execute(delete(User).where(User.id == owner.id))
+        db.session.commit()
+
+
+# -----------------------------------------
+# Baseline
+# -----------------------------------------
+
+def find_regressions(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> list:
+    problems = []
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            limit = max(base[key] * (1 + tolerance), base[key] + min_delta_ms)
+            if current[key] > limit:
+                problems.append(f"{name}: {key} {current[key]} > {limit:.2f} (baseline {base[key]})")
+        if current["queries_per_request"] > base["queries_per_request"]:
+            problems.append(
+                f"{name}: queries/request {current['queries_per_request']} > baseline {base['queries_per_request']}"
+            )
+        if current["errors"]:
+            problems.append(f"{name}: {current['errors']} failed requests")
+    return problems
+
+
+def print_table(results: dict, baseline: dict):
+    base = baseline.get("scenarios", {})
+    header = f"{'scenario':<26}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'queries':>9}{'err':>5}{'base p95':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        ref = base.get(name, {}).get("p95_ms", "")
+        print(f"{name:<26}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['throughput_rps']:>9}"
+              f"{r['queries_per_request']:>9}{r['errors']:>5}{ref:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--offers", type=int, default=150000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="seed processes")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", default="", help="comma-separated scenario name prefixes")
+    parser.add_argument("--expiration-passes", type=int, default=5)
+    parser.add_argument("--expiration-batch", type=int, default=100)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    app.config["UPLOAD_FOLDER"] = tempfile.mkdtemp(prefix="bench-uploads-")
+    ensure_dataset(app, args.users, args.items, args.offers, args.seed, args.workers)
+
+    rng = random.Random(args.seed)
+    counter = QueryCounter()
+    only = [p for p in args.only.split(",") if p]
+    selected = lambda name: not only or any(name.startswith(p) for p in only)
+
+    results = {}
+    creator, creator_name = _fresh_user(app)
+    try:
+        for name, call in build_scenarios(app, creator, creator_name, args.iterations, rng):
+            if selected(name):
+                results[name] = run_scenario(call, args.iterations, args.warmup, counter)
+        if args.expiration_passes and selected("expiration_pass"):
+            results["expiration_pass"] = run_expiration(
+                app, creator_name, args.expiration_passes, args.expiration_batch, counter
+            )
+    finally:
+        cleanup(app, creator_name)
+
+    with app.app_context():
+        meta = {"dialect": db.engine.dialect.name, "items": args.items, "iterations": args.iterations}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    print_table(results, baseline)
+    report = {"meta": meta, "scenarios": results}
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Baseline gravado em {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("Sem baseline para comparar (use --save-baseline).")
+        return 0
+    if baseline.get("meta") != meta:
+        print(f"Aviso: baseline medido com {baseline.get('meta')}, execução atual {meta}.")
+
+    problems = find_regressions(results, baseline, args.tolerance, args.min_delta_ms)
+    for problem in problems:
+        print(f"REGRESSÃO {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,145 @@
 # commands.py
+import os
 import click
-from app import create_app
-from models import db
-from seed import seed_database
+from flask import current_app
+from flask.cli import with_appcontext
+from models import db, Item
 
 @click.command()
-def seed():
-    """Popula o banco com dados mock se estiver vazio."""
-    print("got inside seed func")
+@click.option("--users", type=int, default=None, help="Usuários sintéticos a gerar (modo em escala).")
+@click.option("--items", type=int, default=0, help="Itens a gerar (com 1-4 imagens cada).")
+@click.option("--offers", type=int, default=0, help="Ofertas a distribuir entre os itens (aproximado).")
+@click.option("--seed", "rng_seed", type=int, default=42, help="Semente: mesma semente, mesmos dados.")
+@click.option("--workers", type=int, default=lambda: os.cpu_count() or 1, help="Processos em paralelo.")
+@click.option("--chunk-size", type=int, default=10000, help="Linhas por lote/transação.")
+@with_appcontext
+def seed(users, items, offers, rng_seed, workers, chunk_size):
+    """
+    Sem opções: popula o banco com o conjunto de demonstração se estiver vazio.
+    Com --users/--items/--offers: acrescenta dados sintéticos em volume para benchmark.
+    """
+    # imported here: every `flask` invocation loads this module, few run seed
+    from sqlalchemy.exc import OperationalError, ProgrammingError
+    try:
+        _sync_categories()  # items reference the categories table
+    except (OperationalError, ProgrammingError):
+        db.session.rollback()  # tables not created yet; seed_database reports it
 
-    app = create_app()
-    print("Rodando seed...")
-    seed_database(app)
-    print("Seed concluído!")
+    if users is None:
+        from seed import seed_database
+        seed_database(current_app._get_current_object())
+        return
 
-# Registra o comando
+    from seed_scale import seed_at_scale
+
+    seed_at_scale(db, users=users, items=items, offers=offers, seed=rng_seed,
+                  workers=workers, chunk_size=chunk_size)
+
+def _sync_categories():
+    from utils.categories import sync_categories
+    inserted, backfilled, unknown = sync_categories()
+    if inserted or backfilled:
+        print(f"Categorias: {inserted} inseridas, {backfilled} itens com category_id preenchido.")
+    if unknown:
+        print(f"ATENÇÃO: {unknown} itens com categoria fora de data/categories.py (sem category_id).")
+
+@click.command("sync-categories")
+@with_appcontext
+def sync_categories():
+    """Insere as categorias de data/categories.py que faltam e preenche items.category_id."""
+    _sync_categories()
+    print("Categorias sincronizadas.")
+
+@click.command("reconcile-offer-aggregates")
+@with_appcontext
+def reconcile_offer_aggregates():
+    """Recalcula offer_count/best_price de todos os itens em um único UPDATE."""
+    result = db.session.execute(
+        db.update(Item).values(
+            offer_count=Item.offer_count_subquery(Item.id),
+            best_price=Item.best_price_subquery(Item.id),
+        )
+    )
+    db.session.commit()
+    print(f"Agregados de ofertas recalculados para {result.rowcount} itens.")
+
+@click.command("db-pool-report")
+@click.option("--workers", type=int, default=lambda: int(os.environ.get("GUNICORN_WORKERS", 4)),
+              help="Processos gunicorn que abrem conexões (padrão: $GUNICORN_WORKERS ou 4).")
+@with_appcontext
+def db_pool_report(workers):
+    """Compara o pool configurado com o max_connections do Postgres."""
+    config = current_app.config
+    per_process = config["DB_POOL_SIZE"] + config["DB_MAX_OVERFLOW"]
+    budget = workers * per_process
+
+    print(f"Pool por processo: size={config['DB_POOL_SIZE']} overflow={config['DB_MAX_OVERFLOW']} "
+          f"timeout={config['DB_POOL_TIMEOUT']}s recycle={config['DB_POOL_RECYCLE']}s "
+          f"pre_ping={config['DB_POOL_PRE_PING']} pgbouncer={config['DB_PGBOUNCER']}")
+    print(f"Conexões máximas: {workers} workers x {per_process} = {budget}")
+
+    if db.engine.dialect.name != "postgresql":
+        print("Banco não é Postgres; sem max_connections para comparar.")
+        return
+
+    max_connections = int(db.session.execute(db.text("SHOW max_connections")).scalar())
+    reserved = int(db.session.execute(db.text("SHOW superuser_reserved_connections")).scalar())
+    in_use = db.session.execute(db.text("SELECT count(*) FROM pg_stat_activity")).scalar()
+    available = max_connections - reserved
+    print(f"Postgres: max_connections={max_connections} reservadas={reserved} em uso agora={in_use}")
+
+    if budget > available:
+        print(f"ATENÇÃO: o pool pode abrir {budget} conexões, acima das {available} disponíveis.")
+    else:
+        print(f"OK: {available - budget} conexões de folga.")
+
+@click.command("profile-token")
+@click.option("--ttl", type=int, default=900, help="Validade em segundos.")
+@with_appcontext
+def profile_token(ttl):
+    """Gera um token para o header X-Profile (requer PROFILE_SECRET)."""
+    from utils.profiler import make_token
+
+    secret = current_app.config["PROFILE_SECRET"]
+    if not secret:
+        raise click.ClickException("PROFILE_SECRET não configurado.")
+    print(make_token(secret, ttl))
+
+@click.command("profile-report")
+@click.option("--endpoint", default=None, help="Apenas perfis deste endpoint (ex.: item.list_items).")
+@click.option("--since-minutes", type=int, default=None, help="Apenas perfis dos últimos N minutos.")
+@click.option("--output", "-o", type=click.File("w"), default="-",
+              help="Arquivo de saída no formato collapsed (flamegraph.pl, speedscope).")
+@click.option("--top", type=int, default=15, help="Funções com mais amostras próprias (stderr).")
+@with_appcontext
+def profile_report(endpoint, since_minutes, output, top):
+    """Soma os perfis guardados em PROFILE_DIR em stacks no formato collapsed."""
+    from collections import Counter
+    from datetime import datetime, timedelta
+    from utils.profiler import load_profiles, to_collapsed
+
+    since = datetime.utcnow() - timedelta(minutes=since_minutes) if since_minutes else None
+    stacks, self_samples, profiles = Counter(), Counter(), 0
+    for profile in load_profiles(current_app.config["PROFILE_DIR"], endpoint, since):
+        profiles += 1
+        for stack, count in profile["stacks"].items():
+            stacks[stack] += count
+            self_samples[stack.rsplit(";", 1)[-1]] += count
+
+    if not profiles:
+        raise click.ClickException("Nenhum perfil encontrado.")
+    output.write(to_collapsed(stacks))
+
+    total = sum(stacks.values())
+    click.echo(f"{profiles} perfis, {total} amostras.", err=True)
+    for frame, count in self_samples.most_common(top):
+        click.echo(f"{count / total:7.1%}  {frame}", err=True)
+
+# Registra os comandos
 def init_app(app):
-    app.cli.add_command(seed)
\ No newline at end of file
+    app.cli.add_command(seed)
+    app.cli.add_command(sync_categories)
+    app.cli.add_command(reconcile_offer_aggregates)
+    app.cli.add_command(db_pool_report)
+    app.cli.add_command(profile_token)
+    app.cli.add_command(profile_report)
\ No newline at end of file
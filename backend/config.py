@@ -2,6 +2,21 @@ import os
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
+
+def env_bool(name: str, default: bool = False) -> bool:
+    """Reads a boolean flag from the environment ("1", "true", "yes", "on")."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_map(name: str, default: str = "") -> dict:
+    """Reads "key=value,key=value" from the environment into a dict."""
+    pairs = (item.split("=", 1) for item in os.environ.get(name, default).split(",") if "=" in item)
+    return {key.strip(): value.strip() for key, value in pairs}
+
+
 class Config:
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev_secret_key")
     SQLALCHEMY_DATABASE_URI = os.environ.get(
@@ -12,3 +27,95 @@ class Config:
     UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
     ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB
+
+    # Response compression (opt-in)
+    COMPRESS_ENABLED = env_bool("COMPRESS_ENABLED")
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 500))      # bytes
+    COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))              # gzip 1-9
+    COMPRESS_BR_LEVEL = int(os.environ.get("COMPRESS_BR_LEVEL", 4))        # brotli 0-11
+    COMPRESS_MIMETYPES = {"application/json"}
+
+    # Registers `flask db` (Flask-Migrate); gunicorn.conf.py turns it off for workers
+    MIGRATE_ENABLED = env_bool("MIGRATE_ENABLED", True)
+
+    # Logging: JSON lines written to stderr by a background thread (utils/logging_setup.py)
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")                      # for every itemhub.* logger
+    LOG_LEVELS = env_map("LOG_LEVELS")                                   # per logger, "itemhub.offer_checker=WARNING"
+    LOG_SAMPLING = env_map("LOG_SAMPLING", "itemhub.location=100")       # keep 1 in N records below WARNING
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "json")                    # "json" or "text"
+    LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", 10000))        # records beyond this are dropped
+
+    # Per-request SQL count/time instrumentation (Server-Timing header + log line)
+    REQUEST_TIMING_ENABLED = env_bool("REQUEST_TIMING_ENABLED")
+    QUERY_BUDGET_ENFORCE = env_bool("QUERY_BUDGET_ENFORCE")              # raise instead of warn (tests/debug)
+    QUERY_BUDGET_DEFAULT = int(os.environ.get("QUERY_BUDGET_DEFAULT", 0))  # for undecorated views, 0 = none
+
+    # Slow-query log (utils/slow_queries.py), plans captured in a background thread
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 500))                      # 0 disables
+    SLOW_QUERY_EXPLAIN = env_bool("SLOW_QUERY_EXPLAIN", True)                        # EXPLAIN only, never ANALYZE
+    SLOW_QUERY_EXPLAIN_INTERVAL = float(os.environ.get("SLOW_QUERY_EXPLAIN_INTERVAL", 600))  # s between plans of one statement
+    SLOW_QUERY_LOG_PER_MINUTE = int(os.environ.get("SLOW_QUERY_LOG_PER_MINUTE", 60))  # per process, the rest only counted
+
+    # On-demand sampling profiler (utils/profiler.py); off unless a secret or a rate is set
+    PROFILE_SECRET = os.environ.get("PROFILE_SECRET")                    # signs X-Profile tokens (flask profile-token)
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))  # fraction of requests profiled at random
+    PROFILE_ENDPOINTS = {e.strip() for e in os.environ.get("PROFILE_ENDPOINTS", "").split(",") if e.strip()}  # limits the random sampling
+    PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 2))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", "/tmp/itemhub-profiles")
+    PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", 200))              # newest files kept in PROFILE_DIR
+
+    # Prometheus metrics at /metrics (needs the prometheus_client package);
+    # under gunicorn workers share PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py)
+    METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")  # if set, scrapes need "Authorization: Bearer <token>"
+
+    # Active items per category served from memory (utils/categories.py);
+    # full reload this often, in between only this process's writes move them
+    CATEGORY_COUNTS_REFRESH_SECONDS = float(os.environ.get("CATEGORY_COUNTS_REFRESH_SECONDS", 60))
+
+    # GET /api/items/facets results cached per normalized filter set (per process),
+    # cleared by this process's item writes
+    FACETS_CACHE_TTL = float(os.environ.get("FACETS_CACHE_TTL", 30))           # seconds
+    FACETS_CACHE_SIZE = int(os.environ.get("FACETS_CACHE_SIZE", 1000))
+
+    # Unfiltered listing (home page) served from an in-memory feed of the newest
+    # valid items (utils/home_feed.py, per process); deeper pages go to the database
+    HOME_FEED_ENABLED = env_bool("HOME_FEED_ENABLED", True)
+    HOME_FEED_SIZE = int(os.environ.get("HOME_FEED_SIZE", 500))                       # items kept
+    HOME_FEED_REFRESH_SECONDS = float(os.environ.get("HOME_FEED_REFRESH_SECONDS", 10))  # full rebuild period
+
+    # Authenticated user lookup cache (per process)
+    IDENTITY_CACHE_ENABLED = env_bool("IDENTITY_CACHE_ENABLED", True)
+    IDENTITY_CACHE_TTL = float(os.environ.get("IDENTITY_CACHE_TTL", 30))        # seconds
+    IDENTITY_CACHE_SIZE = int(os.environ.get("IDENTITY_CACHE_SIZE", 10000))
+
+    # Password hashing (Werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:1000000")
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt")
+    PASSWORD_SALT_LENGTH = int(os.environ.get("PASSWORD_SALT_LENGTH", 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))     # 0 = hash inline
+    PASSWORD_HASH_MAX_QUEUE = int(os.environ.get("PASSWORD_HASH_MAX_QUEUE", 8))  # waiting beyond the workers
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 5))    # seconds
+
+    # Database connection pool (per gunicorn worker process)
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 5))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 10))     # seconds waiting for a connection
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))     # seconds, -1 disables
+    DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+    DB_PGBOUNCER = env_bool("DB_PGBOUNCER")                            # transaction pooling mode
+
+    # Offer expiration checker (runs in exactly one gunicorn worker)
+    SCHEDULER_ENABLED = env_bool("SCHEDULER_ENABLED", True)
+    SCHEDULER_INTERVAL_SECONDS = int(os.environ.get("SCHEDULER_INTERVAL_SECONDS", 300))
+    SCHEDULER_LOCK_FILE = os.environ.get("SCHEDULER_LOCK_FILE", "/tmp/itemhub-scheduler.lock")
+
+    # Bulk item import (POST /api/items/bulk)
+    BULK_IMPORT_MAX_ROWS = int(os.environ.get("BULK_IMPORT_MAX_ROWS", 5000))
+    BULK_IMPORT_BATCH_SIZE = int(os.environ.get("BULK_IMPORT_BATCH_SIZE", 200))        # items per transaction
+    BULK_IMPORT_STREAM_THRESHOLD = int(os.environ.get("BULK_IMPORT_STREAM_THRESHOLD", 1000))  # rows before streaming progress
+    BULK_IMPORT_MAX_BYTES = int(os.environ.get("BULK_IMPORT_MAX_BYTES", 256 * 1024 * 1024))  # manifest + archive
+    BULK_IMPORT_MAX_IMAGE_BYTES = int(os.environ.get("BULK_IMPORT_MAX_IMAGE_BYTES", 16 * 1024 * 1024))
+
+    # Optional read replica: read-only requests go there, writes to DATABASE_URL
+    DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+    REPLICA_STICKY_SECONDS = float(os.environ.get("REPLICA_STICKY_SECONDS", 5))  # read-your-writes window
@@ -0,0 +1,43 @@
+# Stored as `categories` rows whose id is the 1-based position in this list
+# (see models.Category); only ever append, never reorder or remove.
+ITEM_CATEGORIES = [
+    "Eletrônicos",
+    "Informática",
+    "Celulares e Acessórios",
+    "Games",
+    "Eletrodomésticos",
+    "Móveis",
+    "Decoração",
+    "Roupas",
+    "Calçados",
+    "Acessórios de Moda",
+    "Esporte e Lazer",
+    "Livros",
+    "Papelaria",
+    "Ferramentas",
+    "Construção",
+    "Automotivo",
+    "Bebês e Infantil",
+    "Brinquedos",
+    "Pet Shop",
+    "Saúde e Beleza",
+    "Perfumaria",
+    "Cozinha",
+    "Alimentos e Bebidas",
+    "Jardinagem",
+    "Colecionáveis",
+    "Instrumentos Musicais",
+    "Arte e Artesanato",
+    "Fotografia",
+    "Som e Áudio",
+    "Filmes e Séries",
+    "Casa Inteligente",
+    "Camping e Aventura",
+    "Relógios",
+    "Joias",
+    "Puzzles e Board Games",
+    "Papelaria e Escritório",
+    "Outros"
+]
+
+CATEGORY_IDS = {name: position for position, name in enumerate(ITEM_CATEGORIES, start=1)}
@@ -0,0 +1,99 @@
+# gunicorn.conf.py
+# Used by docker-compose: gunicorn -c gunicorn.conf.py 'app:create_app()'
+#
+# Worker models (GUNICORN_WORKER_CLASS):
+#   - gthread (default): GUNICORN_THREADS requests per process, good fit for
+#     our I/O-bound endpoints (DB round trips, image uploads).
+#   - sync: one request per process (previous behaviour).
+#   - gevent: green threads; needs the optional `gevent` and `psycogreen` packages.
+#
+# The app is preloaded in the master (GUNICORN_PRELOAD, on by default): modules
+# are imported and parsed once and workers share those pages copy-on-write.
+# Code changes then need a full restart, not a HUP.
+import gc
+import os
+import shutil
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5887")
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", 4)) if worker_class == "gthread" else 1
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 100))  # gevent only
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
+# gevent must monkey-patch before the app imports threading/ssl: no preload there
+preload_app = os.environ.get(
+    "GUNICORN_PRELOAD", "0" if worker_class == "gevent" else "1"
+).strip().lower() in ("1", "true", "yes", "on")
+
+if preload_app:
+    # a collection in the master touches every object header and un-shares
+    # the pages; collect again in the workers, after fork (see post_fork)
+    gc.disable()
+
+# Prometheus multiprocess mode: each worker writes its metric values to this
+# directory and /metrics merges them. Must be set before prometheus_client is
+# imported (workers import the app after this file runs).
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/itemhub-metrics")
+
+
+def _reset_metrics_dir():
+    # values from a previous run would be merged into the new ones. Done here,
+    # not in on_starting, because a preloaded app creates its files before that
+    # hook; only once per master since a HUP reads this file again.
+    if os.environ.get("ITEMHUB_METRICS_MASTER_PID") == str(os.getpid()):
+        return
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    os.environ["ITEMHUB_METRICS_MASTER_PID"] = str(os.getpid())
+
+
+_reset_metrics_dir()
+
+# Every thread may hold a DB connection: unless told otherwise, size the
+# per-process pool to the thread count (read by config.Config in the worker).
+if worker_class == "gthread":
+    os.environ.setdefault("DB_POOL_SIZE", str(threads))
+
+# workers never run migrations: skip Flask-Migrate/alembic imports
+os.environ.setdefault("MIGRATE_ENABLED", "0")
+
+
+def child_exit(server, worker):
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        # everything allocated so far (the preloaded app) goes to a permanent
+        # generation the collector never scans, so it stays shared
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+        # connections opened in the master (if any) must not be shared
+        from models import db
+        with worker.app.wsgi().app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+    if worker_class == "gevent":
+        # make psycopg2 cooperative, otherwise every query blocks the whole worker
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def post_worker_init(worker):
+    # Only one process in the whole deployment actually runs the checker
+    # (see scheduler.start_scheduler), the others return immediately.
+    from scheduler import start_scheduler
+    start_scheduler(worker.wsgi)
@@ -1,19 +1,28 @@
 from datetime import datetime, timedelta
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy import func, text
+from sqlalchemy.sql.expression import ClauseElement, FunctionElement
+from sqlalchemy import DateTime, event, func, case, inspect, or_, select
+from sqlalchemy.orm import validates
 
-db = SQLAlchemy()
+from data.categories import CATEGORY_IDS
+from utils.db_routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 class User(db.Model):
     __tablename__ = "users"
 
     id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(80), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
+    # uniqueness is case-insensitive, see uq_users_*_lower below
+    username = db.Column(db.String(80), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
     password_hash = db.Column(db.String(512), nullable=False)
     full_name = db.Column(db.String(120))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # embedded in the JWT ("ver" claim); bump it to revoke issued tokens
+    account_version = db.Column(db.Integer, nullable=False, default=1, server_default="1")
 
     items = db.relationship("Item", back_populates="owner", cascade="all, delete-orphan")
     offers = db.relationship("Offer", back_populates="user", cascade="all, delete-orphan")
@@ -36,6 +45,13 @@ class User(db.Model):
             return None
         return User.query.get(user_id)
 
+    @staticmethod
+    def get_by_username(username: str):
+        """Case-insensitive lookup, served by uq_users_username_lower."""
+        if not username:
+            return None
+        return User.query.filter(func.lower(User.username) == username.lower()).first()
+
 class ItemImage(db.Model):
     __tablename__ = "item_images"
 
@@ -58,6 +74,42 @@ class ItemImage(db.Model):
         }
 
 
+class add_days(FunctionElement):
+    """`timestamp + n days` in SQL; compiled per dialect (SQLite has no INTERVAL)."""
+    type = DateTime()
+    inherit_cache = True
+    name = "add_days"
+
+
+@compiles(add_days)
+def _add_days_default(element, compiler, **kw):
+    timestamp, days = list(element.clauses)
+    return f"({compiler.process(timestamp, **kw)} + {compiler.process(days, **kw)} * INTERVAL '1 day')"
+
+
+@compiles(add_days, "sqlite")
+def _add_days_sqlite(element, compiler, **kw):
+    timestamp, days = list(element.clauses)
+    return (f"datetime({compiler.process(timestamp, **kw)}, "
+            f"'+' || {compiler.process(days, **kw)} || ' days')")
+
+
+class Category(db.Model):
+    """Reference table mirroring data/categories.py (id = position in ITEM_CATEGORIES)."""
+    __tablename__ = "categories"
+
+    id = db.Column(db.SmallInteger, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(50), nullable=False, unique=True)
+
+    def to_dict(self):
+        return {"id": self.id, "name": self.name}
+
+
+@event.listens_for(Category.__table__, "after_create")
+def _insert_categories(target, connection, **kw):
+    connection.execute(target.insert(), [{"id": cid, "name": name} for name, cid in CATEGORY_IDS.items()])
+
+
 class Item(db.Model):
     __tablename__ = "items"
 
@@ -68,6 +120,8 @@ class Item(db.Model):
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     category = db.Column(db.String(50), nullable=False)
+    # set from `category` (see _set_category_id); filters and counts use the id
+    category_id = db.Column(db.SmallInteger, db.ForeignKey("categories.id"))
     image_url = db.Column(db.String(200))  # legacy single image
 
     offer_type = db.Column(db.String(20))
@@ -84,6 +138,14 @@ class Item(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(20), default="ativo")
 
+    # -------------------------------
+    # Denormalized offer aggregates (live offers only, see Offer.allowed_statuses)
+    # kept up to date by the offer routes / expiration checker,
+    # rebuilt in bulk by `flask reconcile-offer-aggregates`
+    # -------------------------------
+    offer_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    best_price = db.Column(db.Float)
+
     owner = db.relationship("User", back_populates="items")
     offers = db.relationship("Offer", back_populates="item", cascade="all, delete-orphan")
 
@@ -96,13 +158,22 @@ class Item(db.Model):
     )
 
    
+    @validates("category")
+    def _set_category_id(self, key, name):
+        self.category_id = CATEGORY_IDS.get(name)
+        return name
+
     # ------------------------------
     # Helper properties/methods
     # ------------------------------
-    @property
+    @hybrid_property
     def expires_at(self):
         return self.created_at + timedelta(days=self.duration_days)
 
+    @expires_at.expression
+    def expires_at(cls):
+        return add_days(cls.created_at, cls.duration_days)
+
     def is_expired(self):
         return datetime.now() >= self.expires_at
 
@@ -116,14 +187,80 @@ class Item(db.Model):
 
     @is_valid.expression
     def is_valid(cls):
-        """SQL version executed inside WHERE queries (PostgreSQL)."""
+        """SQL version executed inside WHERE queries."""
         return (
             cls.status.in_(["pendendo_confirmacao", "ativo"])
             &
-            (
-                func.now()
-                < (cls.created_at + (cls.duration_days * text("INTERVAL '1 day'")))
-            )
+            (func.now() < cls.expires_at)
+        )
+
+    # ------------------------------
+    # Offer aggregates maintenance
+    # ------------------------------
+    # Counters are assigned as SQL expressions so they are applied inside the
+    # item's UPDATE of the current transaction (no read-modify-write race).
+    # A new expression replaces a pending one instead of adding to it, so a
+    # second change in the same transaction writes the first one out first.
+
+    def offer_added(self, price: float):
+        """A new live offer was created for this item."""
+        self._flush_pending_aggregates()
+        self.offer_count = Item.offer_count + 1
+        self._raise_best_price(price)
+
+    def offer_removed(self, price: float):
+        """A live offer left the live set (cancelled, declined, negotiated)."""
+        self._flush_pending_aggregates()
+        current_best = self.best_price
+        self.offer_count = Item.offer_count - 1
+        if current_best is None or price >= current_best:
+            self._recompute_best_price()
+
+    def offer_price_changed(self, old_price: float, new_price: float):
+        """A live offer was edited."""
+        self._flush_pending_aggregates()
+        if new_price >= old_price:
+            self._raise_best_price(new_price)
+        elif self.best_price is None or old_price >= self.best_price:
+            self._recompute_best_price()
+
+    def refresh_offer_aggregates(self):
+        """Recomputes both aggregates from the offers table."""
+        db.session.flush()
+        self.offer_count = Item.offer_count_subquery(self.id)
+        self.best_price = Item.best_price_subquery(self.id)
+
+    def _flush_pending_aggregates(self):
+        # also makes best_price a number again (reloaded) for the comparisons
+        pending = inspect(self).dict
+        if any(isinstance(pending.get(name), ClauseElement) for name in ("offer_count", "best_price")):
+            db.session.flush()
+
+    def _raise_best_price(self, price: float):
+        self.best_price = case(
+            (or_(Item.best_price.is_(None), Item.best_price < price), price),
+            else_=Item.best_price,
+        )
+
+    def _recompute_best_price(self):
+        # the offer change must hit the table before the subquery reads it
+        db.session.flush()
+        self.best_price = Item.best_price_subquery(self.id)
+
+    @staticmethod
+    def offer_count_subquery(item_id):
+        return (
+            select(func.count(Offer.id))
+            .where(Offer.item_id == item_id, Offer.status.in_(Offer.allowed_statuses()))
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def best_price_subquery(item_id):
+        return (
+            select(func.max(Offer.price))
+            .where(Offer.item_id == item_id, Offer.status.in_(Offer.allowed_statuses()))
+            .scalar_subquery()
         )
     
     def get_primary_image(self):
@@ -155,6 +292,7 @@ class Item(db.Model):
             "title": self.title,
             "description": self.description,
             "category": self.category,
+            "category_id": self.category_id,
             "image_url": self.get_primary_image(),
             "images": self.images_to_list(),
             "offer_type": self.offer_type,
@@ -168,7 +306,10 @@ class Item(db.Model):
             "duration_days": self.duration_days,
             "created_at": self.created_at.isoformat(),
             "status": self.status,
-            "expires_at": self.expires_at.isoformat()
+            "expires_at": self.expires_at.isoformat(),
+
+            "offer_count": self.offer_count,
+            "best_price": self.best_price
         }
         return data
 
@@ -224,6 +365,7 @@ class Offer(db.Model):
 
     @staticmethod
     def allowed_statuses():
+        # keep in sync with the uq_offers_user_item_live partial index
         return ["ativo", "pendendo_confirmacao"]
 
     @staticmethod
@@ -239,3 +381,40 @@ class Offer(db.Model):
                 )
                 .first()
         )
+
+
+# ------------------------------
+# User indexes
+# ------------------------------
+# case-insensitive uniqueness; register relies on these (IntegrityError -> 409)
+# and login looks users up through lower(username)
+db.Index("uq_users_username_lower", func.lower(User.username), unique=True)
+db.Index("uq_users_email_lower", func.lower(User.email), unique=True)
+
+
+# ------------------------------
+# Item indexes
+# ------------------------------
+# category filter of the marketplace (newest first) and the per-category
+# active counts (utils/categories.py)
+db.Index("ix_items_category_status_created", Item.category_id, Item.status, Item.created_at.desc())
+
+
+# ------------------------------
+# Offer indexes
+# ------------------------------
+# keyset pagination of "my offers" (user dashboard)
+db.Index("ix_offers_user_created", Offer.user_id, Offer.created_at.desc(), Offer.id.desc())
+# offers of one item, newest first / best price first (item page)
+db.Index("ix_offers_item_status_created", Offer.item_id, Offer.status, Offer.created_at.desc())
+db.Index("ix_offers_item_status_price", Offer.item_id, Offer.status, Offer.price.desc())
+# at most one live offer per user per item; enforced by the database so
+# create_offer needs no pre-check and concurrent requests cannot both pass
+db.Index(
+    "uq_offers_user_item_live",
+    Offer.user_id,
+    Offer.item_id,
+    unique=True,
+    postgresql_where=Offer.status.in_(["ativo", "pendendo_confirmacao"]),
+    sqlite_where=Offer.status.in_(["ativo", "pendendo_confirmacao"]),
+)
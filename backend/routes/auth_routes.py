@@ -1,11 +1,21 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from models import db, User
 from datetime import timedelta
 from flask_jwt_extended import set_access_cookies, unset_jwt_cookies
+from utils.identity import identity_cache, identity_claims, remember_user
+from utils.passwords import password_hasher, HashingOverloaded
+from utils.metrics import LOGINS, REGISTRATIONS
 auth_bp = Blueprint("auth", __name__)
 
+
+def _busy_response():
+    resp = jsonify({"error": "Server busy, please try again"})
+    resp.headers["Retry-After"] = "1"
+    return resp, 503
+
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     """
@@ -26,14 +36,17 @@ def register():
 
     **Business rules & logic:**
     - All fields except `full_name` are required.
-    - Usernames and emails must be unique — duplicates trigger a 409 conflict.
-    - Passwords are securely hashed using Werkzeug’s `generate_password_hash`.
+    - Usernames and emails must be unique (case-insensitive) — duplicates trigger a 409 conflict.
+      Enforced by the database's unique indexes, no pre-insert lookup.
+    - Passwords are securely hashed using Werkzeug’s `generate_password_hash`,
+      in the bounded hashing pool (see utils/passwords.py).
     - On success, the new user is committed to the database.
 
     **Responses:**
     - `201 CREATED` → user successfully created.
     - `400 BAD REQUEST` → missing required fields.
     - `409 CONFLICT` → username or email already taken.
+    - `503 SERVICE UNAVAILABLE` → hashing pool saturated, retry shortly.
 
     **Notes:**
     - Passwords are never returned to the client.
@@ -44,10 +57,11 @@ def register():
     if not data or "username" not in data or "password" not in data or "email" not in data:
         return jsonify({"error": "Missing required fields"}), 400
 
-    if User.query.filter((User.username == data["username"]) | (User.email == data["email"])).first():
-        return jsonify({"error": "Username or email already taken"}), 409
-
-    hashed_pw = generate_password_hash(data["password"])
+    try:
+        hashed_pw = password_hasher.hash(data["password"])
+    except HashingOverloaded:
+        REGISTRATIONS.labels("busy").inc()
+        return _busy_response()
     user = User(
         username=data["username"],
         email=data["email"],
@@ -55,24 +69,52 @@ def register():
         full_name=data.get("full_name")
     )
     db.session.add(user)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # uq_users_username_lower / uq_users_email_lower
+        db.session.rollback()
+        REGISTRATIONS.labels("conflict").inc()
+        return jsonify({"error": "Username or email already taken"}), 409
 
+    REGISTRATIONS.labels("success").inc()
     return jsonify({"message": "User registered successfully"}), 201
 
 @auth_bp.route("/login", methods=["POST"])
 def login():
     data = request.get_json()
-    user:User = User.query.filter_by(username=data.get("username")).first()
+    user:User = User.get_by_username(data.get("username"))
+
+    if not user or not data.get("password"):
+        LOGINS.labels("failure").inc()
+        return jsonify({"error": "Invalid credentials"}), 401
 
-    if not user or not check_password_hash(user.password_hash, data.get("password")):
+    try:
+        ok, new_hash = password_hasher.verify(user.password_hash, data.get("password"))
+    except HashingOverloaded:
+        LOGINS.labels("busy").inc()
+        return _busy_response()
+    if not ok:
+        LOGINS.labels("failure").inc()
         return jsonify({"error": "Invalid credentials"}), 401
 
-    access_token = create_access_token(identity=str(user.id), expires_delta=timedelta(hours=6))
+    if new_hash:
+        # stored hash used older/weaker parameters: upgrade it transparently
+        user.password_hash = new_hash
+        db.session.commit()
+
+    remember_user(user)
+    access_token = create_access_token(
+        identity=str(user.id),
+        additional_claims=identity_claims(user),
+        expires_delta=timedelta(hours=6)
+    )
     resp = jsonify({
         "message": "Login successful",
         "user": user.to_dict()
     })
     set_access_cookies(resp, access_token)
+    LOGINS.labels("success").inc()
     return resp, 200
 
 @auth_bp.route("/logout", methods=["POST"])
@@ -119,8 +161,11 @@ def me():
     - No sensitive data (like password hashes) is ever returned.
     """
     user_id = int(get_jwt_identity())
+    # full profile is needed here, so this one always reads the row
     user:User = User.get_by_id(user_id)
     if not user:
         #has a jwt identity but its not registered on base
+        identity_cache.invalidate(user_id)
         return jsonify({"error": "not propperly logged in"}), 401
+    remember_user(user)
     return jsonify(user.to_dict())
@@ -0,0 +1,16 @@
+from flask import Blueprint, jsonify
+from models import db
+from utils.db_pool import pool_stats
+
+health_bp = Blueprint("health", __name__)
+
+
+@health_bp.route("/db", methods=["GET"])
+def db_pool_health():
+    """
+    GET /api/health/db
+    ------------------
+    Connection pool occupancy and checkout wait counters of the worker
+    process that answered. Used to size DB_POOL_SIZE / DB_MAX_OVERFLOW.
+    """
+    return jsonify(pool_stats(db.engine)), 200
@@ -1,14 +1,27 @@
 import os
 from datetime import datetime
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+from flask import Blueprint, Response, request, jsonify, current_app, send_from_directory, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
-from models import db, Item, User, ItemImage
-from utils.image_processing import save_uploaded_image
+from sqlalchemy import case, delete, insert, update
+from sqlalchemy.orm import selectinload
+from models import db, Item, ItemImage
+from utils.image_processing import save_uploaded_image, remove_uploaded_images
+from utils.identity import CurrentUser, resolve_current_user
+from utils.request_timing import query_budget
+from utils.metrics import ITEMS_CREATED, IMAGES_UPLOADED, HOME_FEED_REQUESTS
 import json
-import requests
 from utils.location import is_valid_state, is_valid_city
 from config import Config
+from data.categories import CATEGORY_IDS, ITEM_CATEGORIES
+from utils.categories import category_counts
+from utils.facets import cached_facets
+from utils.home_feed import home_feed
+from utils.db_routing import reads_own_writes
+from werkzeug.datastructures import ImmutableMultiDict
+from utils.bulk_import import (
+    BulkImportError, parse_manifest, open_archive, validate_rows, import_items, build_report,
+)
 
 item_bp = Blueprint("item", __name__)
 
@@ -22,9 +35,9 @@ def allowed_file(filename):
 # ---------- Routes ----------
 @item_bp.route("/", methods=["POST"])
 @jwt_required()
+@query_budget(4)
 def create_item():
-    user_id = int(get_jwt_identity())
-    user: User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         return jsonify({"error": "not properly logged in"}), 401
 
@@ -42,6 +55,8 @@ def create_item():
         return jsonify({"error": "Missing required fields"}), 400
     if duration_days not in [1, 7, 15, 30]:
         return jsonify({"error": "Invalid duration"}), 400
+    if category not in CATEGORY_IDS:
+        return jsonify({"error": f"Invalid category: {category}"}), 400
 
     # ----------------------------------------------------------
     # LOCATION VALIDATION USING THE NEW CORE HELPERS
@@ -56,10 +71,10 @@ def create_item():
         return jsonify({"error": f"Invalid city '{city}' for state '{state}'"}), 400
 
     # ----------------------------------------------------------
-    # MULTIPLE IMAGE HANDLING (unchanged)
+    # MULTIPLE IMAGE HANDLING
+    # validate every file before writing any of them
     # ----------------------------------------------------------
     uploaded_files = request.files.getlist("images")
-    saved_images = []
 
     legacy_single = request.files.get("image")
     if legacy_single:
@@ -69,57 +84,133 @@ def create_item():
         if not f or not allowed_file(f.filename):
             return jsonify({"error": "Invalid file type"}), 415
 
-        filename = save_uploaded_image(
-            file_storage=f,
-            upload_folder=current_app.config["UPLOAD_FOLDER"]
+    # ----------------------------------------------------------
+    # CREATE ITEM + IMAGES IN ONE TRANSACTION
+    # files are written first; if anything fails before the commit
+    # the transaction is rolled back and the files are removed
+    # ----------------------------------------------------------
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    saved_images = []
+    try:
+        for f in uploaded_files:
+            saved_images.append(save_uploaded_image(file_storage=f, upload_folder=upload_folder))
+
+        main_image_url = None
+        if saved_images:
+            main_image_url = f"/items/image/{saved_images[0]}"
+
+        item = Item(
+            owner_id=user.id,
+            owner_username=user.username,
+            title=title,
+            description=request.form.get("description"),
+            category=category,
+            offer_type=offer_type,
+            volume=request.form.get("volume", type=float),
+            state=state,
+            city=city,
+            address=address,
+            duration_days=duration_days,
+            image_url=main_image_url,
+            created_at=datetime.utcnow(),
         )
-        saved_images.append(filename)
 
-    main_image_url = None
-    if saved_images:
-        main_image_url = f"/items/image/{saved_images[0]}"
+        db.session.add(item)
+        db.session.flush()  # assigns item.id, no commit yet
+
+        # Save item images (single multi-row INSERT)
+        if saved_images:
+            db.session.execute(insert(ItemImage), [
+                {
+                    "item_id": item.id,
+                    "image_url": f"/items/image/{filename}",
+                    "position": idx,
+                    "enabled": True,
+                }
+                for idx, filename in enumerate(saved_images)
+            ])
 
-    # ----------------------------------------------------------
-    # CREATE ITEM
-    # ----------------------------------------------------------
-    item = Item(
-        owner=user,
-        owner_username=user.username,
-        title=title,
-        description=request.form.get("description"),
-        category=category,
-        offer_type=offer_type,
-        volume=request.form.get("volume", type=float),
-        state=state,
-        city=city,
-        address=address,
-        duration_days=duration_days,
-        image_url=main_image_url,
-        created_at=datetime.utcnow(),
-    )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        remove_uploaded_images(saved_images, upload_folder)
+        raise
 
-    db.session.add(item)
-    db.session.commit()
+    ITEMS_CREATED.labels("single").inc()
+    IMAGES_UPLOADED.labels("create").inc(len(saved_images))
+    return jsonify({"message": "Item created successfully", "item_id": item.id}), 201
 
-    # Save item images
-    for idx, filename in enumerate(saved_images):
-        db.session.add(ItemImage(
-            item_id=item.id,
-            image_url=f"/items/image/{filename}",
-            position=idx,
-            enabled=True
-        ))
 
-    db.session.commit()
+@item_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_create_items():
+    """
+    POST /api/items/bulk (multipart)
+    --------------------------------
+    - manifest: .ndjson or .csv file, one item per row/line
+      (same fields as POST /api/items/, `images` = names inside the archive)
+    - images: optional .zip with the files referenced by the manifest
+    - format: optional "ndjson" | "csv" (otherwise taken from the extension)
+    - stream=1: respond with NDJSON progress events instead of one JSON body
+      (forced above BULK_IMPORT_STREAM_THRESHOLD rows)
+
+    Every row is validated first; valid rows are inserted in batches
+    (one transaction per batch), invalid ones are reported and skipped.
+
+    **Response:** {"total", "created", "failed", "results": [{"row", "status", "item_id" | "errors"}]}
+    """
+    user: CurrentUser = resolve_current_user()
+    if not user:
+        return jsonify({"error": "not properly logged in"}), 401
 
-    return jsonify({"message": "Item created successfully", "item_id": item.id}), 201
+    cfg = current_app.config
+    request.max_content_length = cfg["BULK_IMPORT_MAX_BYTES"]
+
+    manifest = request.files.get("manifest")
+    if not manifest:
+        return jsonify({"error": "manifest file is required"}), 400
+
+    try:
+        rows = parse_manifest(manifest, request.form.get("format"))
+        archive, entries = open_archive(request.files.get("images"), cfg["BULK_IMPORT_MAX_IMAGE_BYTES"])
+    except BulkImportError as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    if not rows:
+        return jsonify({"error": "manifest is empty"}), 400
+    if len(rows) > cfg["BULK_IMPORT_MAX_ROWS"]:
+        return jsonify({"error": f"manifest has more than {cfg['BULK_IMPORT_MAX_ROWS']} rows"}), 413
+
+    valid, errors = validate_rows(rows, entries)
+    results = {}
+    progress = import_items(
+        valid, archive, entries, user,
+        upload_folder=cfg["UPLOAD_FOLDER"],
+        batch_size=cfg["BULK_IMPORT_BATCH_SIZE"],
+        results=results,
+    )
+
+    stream = request.args.get("stream") == "1" or len(rows) > cfg["BULK_IMPORT_STREAM_THRESHOLD"]
+    if not stream:
+        for _ in progress:
+            pass
+        return jsonify(build_report(len(rows), errors, results)), 200
+
+    def generate():
+        yield json.dumps({"event": "validated", "total": len(rows), "invalid": len(errors)}) + "\n"
+        for event in progress:
+            yield json.dumps(event) + "\n"
+        yield json.dumps({"event": "done", **build_report(len(rows), errors, results)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 @item_bp.route("/<int:item_id>", methods=["PUT"])
 @jwt_required()
+@query_budget(7)
 def update_item(item_id):
     user_id = int(get_jwt_identity())
-    user: User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         return jsonify({"error": "not properly logged in"}), 401
 
@@ -148,6 +239,9 @@ def update_item(item_id):
         if field in data:
             setattr(item, field, data[field])
 
+    if "category" in data and item.category_id is None:  # set by Item._set_category_id
+        return jsonify({"error": f"Invalid category: {item.category}"}), 400
+
     # -------------------------------------------------------
     # LOCATION VALIDATION (only if user changed the fields)
     # -------------------------------------------------------
@@ -165,7 +259,7 @@ def update_item(item_id):
             return jsonify({"error": f"Invalid city '{city}' for state '{state}'"}), 400
 
     # -------------------------------------------------------
-    # IMAGE HANDLING (unchanged)
+    # IMAGE HANDLING
     # -------------------------------------------------------
 
     clear_images = data.get("clear_images") in ["1", "true", True]
@@ -176,147 +270,238 @@ def update_item(item_id):
         return jsonify({"message": "Item updated"}), 200
 
     delete_ids = request.form.getlist("delete_image_ids")
-    delete_ids = [int(x) for x in delete_ids if x.isdigit()]
-
-    if delete_ids:
-        ItemImage.query.filter(
-            ItemImage.item_id == item.id,
-            ItemImage.id.in_(delete_ids)
-        ).delete(synchronize_session=False)
+    delete_ids = {int(x) for x in delete_ids if x.isdigit()}
 
+    order_list = None
     new_order_raw = data.get("new_image_order")
     if new_order_raw:
         try:
-            order_list = json.loads(new_order_raw)
-            order_list = [int(x) for x in order_list]
-
-            existing_images = ItemImage.query.filter_by(item_id=item.id).all()
-            img_map = {img.id: img for img in existing_images}
-
-            for pos, img_id in enumerate(order_list):
-                if img_id in img_map:
-                    img_map[img_id].position = pos
-                    img_map[img_id].enabled = True
-
-            tail = len(order_list)
-            for img in existing_images:
-                if img.id not in order_list:
-                    img.position = tail
-                    tail += 1
+            order_list = [int(x) for x in json.loads(new_order_raw)]
         except Exception:
             return jsonify({"error": "Invalid new_image_order JSON"}), 400
 
-    remaining = ItemImage.query.filter_by(item_id=item.id).order_by(ItemImage.position).all()
-    for i, img in enumerate(remaining):
-        img.position = i
-
     new_files = request.files.getlist("images")
     legacy_single = request.files.get("image")
     if legacy_single:
         new_files.append(legacy_single)
 
-    saved_images = []
     for f in new_files:
         if not f or not allowed_file(f.filename):
             return jsonify({"error": "Invalid file type"}), 415
 
-        filename = save_uploaded_image(
-            file_storage=f,
-            upload_folder=current_app.config["UPLOAD_FOLDER"]
-        )
-        saved_images.append(filename)
+    # Load the item's images once and compute the final ordering in memory
+    images = (
+        ItemImage.query
+        .filter_by(item_id=item.id)
+        .order_by(ItemImage.position, ItemImage.id)
+        .all()
+    )
+    kept, enable_ids = _order_images(images, delete_ids, order_list)
+
+    upload_folder = current_app.config["UPLOAD_FOLDER"]
+    saved_images = []
+    try:
+        for f in new_files:
+            saved_images.append(save_uploaded_image(file_storage=f, upload_folder=upload_folder))
+
+        removed = [img.id for img in images if img.id in delete_ids]
+        if removed:
+            db.session.execute(
+                delete(ItemImage)
+                .where(ItemImage.item_id == item.id, ItemImage.id.in_(removed))
+                .execution_options(synchronize_session=False)
+            )
 
-    if saved_images:
-        start_pos = len(remaining)
-        for i, filename in enumerate(saved_images):
-            db.session.add(ItemImage(
-                item_id=item.id,
-                image_url=f"/items/image/{filename}",
-                position=start_pos + i,
-                enabled=True
-            ))
+        # single UPDATE ... SET position = CASE id ... for rows that moved/got enabled
+        new_positions = {
+            img.id: pos for pos, img in enumerate(kept)
+            if img.position != pos or (img.id in enable_ids and not img.enabled)
+        }
+        if new_positions:
+            values = {"position": case(new_positions, value=ItemImage.id)}
+            to_enable = [img_id for img_id in enable_ids if img_id in new_positions]
+            if to_enable:
+                values["enabled"] = case(
+                    {img_id: True for img_id in to_enable},
+                    value=ItemImage.id,
+                    else_=ItemImage.enabled,
+                )
+            db.session.execute(
+                update(ItemImage)
+                .where(ItemImage.id.in_(new_positions))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
 
-        remaining = ItemImage.query.filter_by(item_id=item.id).order_by(ItemImage.position).all()
+        new_urls = [f"/items/image/{filename}" for filename in saved_images]
+        if new_urls:
+            db.session.execute(insert(ItemImage), [
+                {
+                    "item_id": item.id,
+                    "image_url": url,
+                    "position": len(kept) + i,
+                    "enabled": True,
+                }
+                for i, url in enumerate(new_urls)
+            ])
+
+        # primary image = first in the final ordering, no extra query
+        ordered_urls = [img.image_url for img in kept] + new_urls
+        item.image_url = ordered_urls[0] if ordered_urls else None
 
-    first = ItemImage.query.filter_by(item_id=item.id).order_by(ItemImage.position).first()
-    item.image_url = first.image_url if first else None
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        remove_uploaded_images(saved_images, upload_folder)
+        raise
 
-    db.session.commit()
+    IMAGES_UPLOADED.labels("update").inc(len(saved_images))
     return jsonify({"message": "Item updated"}), 200
 
-@item_bp.route("/", methods=["GET"])
-def list_items():
+
+def _order_images(images, delete_ids, order_list):
     """
-    GET /api/items/
-    Fully supports:
-      - Multi-category (comma-separated)
-      - Multi-state & multi-city
-      - Full-text search in title + description
-      - Proper pagination response
+    Final ordering of an item's existing images.
+
+    `images` must come sorted by (position, id). Deleted ids are dropped;
+    ids in `order_list` come first in that order (and get enabled), the
+    rest keep their relative order after them.
+    Returns (kept images in final order, ids to enable).
     """
-    # ------------------------------
-    # Query parameters
-    # ------------------------------
-    categories = request.args.get("categories", "")
-    owner_id = request.args.get("owner_id", type=int)
-    offer_types = request.args.get("offer_type", "")
-    
-    raw_states = request.args.get("states", "")
-    raw_cities = request.args.get("cities", "")
-    
-    search = request.args.get("search", "").strip()
-    status = request.args.get("status", "ativo")
-    
-    page = max(1, request.args.get("page", default=1, type=int))
-    page_size = min(100, max(1, request.args.get("page_size", default=20, type=int)))
+    kept = [img for img in images if img.id not in delete_ids]
+    if not order_list:
+        return kept, set()
 
-    # Normalize lists
-    categories = [c.strip() for c in categories.split(",") if c.strip()]
-    states = [s.strip() for s in raw_states.split(",") if s.strip()]
-    cities = [c.strip() for c in raw_cities.split(",") if c.strip()]
-    offer_types = [c.strip() for c in offer_types.split(",") if c.strip()] 
-    # ------------------------------
-    # Base query
-    # ------------------------------
-    query = Item.query.filter_by(status=status)
+    rank = {}
+    for pos, img_id in enumerate(order_list):
+        rank.setdefault(img_id, pos)
+
+    listed = sorted((img for img in kept if img.id in rank), key=lambda img: rank[img.id])
+    rest = [img for img in kept if img.id not in rank]
+    return listed + rest, {img.id for img in listed}
+
+def _split_arg(args, name):
+    return [v.strip() for v in args.get(name, "").split(",") if v.strip()]
 
-    if status == "ativo":
+
+def _item_filters(args) -> dict:
+    """
+    Normalized listing filters (shared by list_items and item_facets).
+    Lists are sorted and de-duplicated, so equivalent query strings give
+    equal dicts (the facet cache key).
+    """
+    return {
+        "status": args.get("status", "ativo"),
+        "owner_id": args.get("owner_id", type=int),
+        # unknown names match nothing
+        "category_ids": sorted({CATEGORY_IDS.get(c, 0) for c in _split_arg(args, "categories")}),
+        "states": sorted(set(_split_arg(args, "states"))),
+        "cities": sorted(set(_split_arg(args, "cities"))),
+        "offer_types": sorted(set(_split_arg(args, "offer_type"))),
+        "search": args.get("search", "").strip(),
+        "min_offers": args.get("min_offers", type=int) or 0,
+    }
+
+
+def _filtered_items(filters: dict):
+    """Item query with every filter of `_item_filters` applied."""
+    query = Item.query.filter_by(status=filters["status"])
+
+    if filters["status"] == "ativo":
         query = query.filter(Item.is_valid)
 
-    if owner_id is not None:
-        query = query.filter_by(owner_id=owner_id)
+    if filters["owner_id"] is not None:
+        query = query.filter_by(owner_id=filters["owner_id"])
 
-    if offer_types:
-        query = query.filter(Item.offer_type.in_(offer_types))
+    if filters["offer_types"]:
+        query = query.filter(Item.offer_type.in_(filters["offer_types"]))
 
     # Multi-category: item must have ANY of the selected categories
-    if categories:
-        query = query.filter(Item.category.in_(categories))
+    if filters["category_ids"]:
+        query = query.filter(Item.category_id.in_(filters["category_ids"]))
 
     # Multi-state / multi-city
-    if states:
-        query = query.filter(Item.state.in_(states))
-    if cities:
-        query = query.filter(Item.city.in_(cities))
+    if filters["states"]:
+        query = query.filter(Item.state.in_(filters["states"]))
+    if filters["cities"]:
+        query = query.filter(Item.city.in_(filters["cities"]))
+
+    if filters["min_offers"]:
+        query = query.filter(Item.offer_count >= filters["min_offers"])
 
     # Full-text search in title OR description
-    if search:
-        search_pattern = f"%{search}%"
+    if filters["search"]:
+        search_pattern = f"%{filters['search']}%"
         query = query.filter(
             db.or_(
                 Item.title.ilike(search_pattern),
                 Item.description.ilike(search_pattern)
             )
         )
+    return query
+
+
+# no filters at all: the home page, served from utils/home_feed.py when possible
+DEFAULT_FILTERS = _item_filters(ImmutableMultiDict())
+
+
+def _home_feed_page(page: int, page_size: int):
+    """list_items' response for the unfiltered listing from the materialized feed, or None."""
+    served = home_feed.page((page - 1) * page_size, page_size)
+    if served is None:
+        HOME_FEED_REQUESTS.labels("database").inc()
+        return None
+    cards, total_items = served
+    HOME_FEED_REQUESTS.labels("feed").inc()
+    body = '{"items":[%s],"page":%d,"page_size":%d,"total_items":%d,"total_pages":%d}\n' % (
+        ",".join(cards), page, page_size, total_items, (total_items + page_size - 1) // page_size,
+    )
+    return current_app.response_class(body, mimetype="application/json")
+
+
+@item_bp.route("/", methods=["GET"])
+@query_budget(3)
+def list_items():
+    """
+    GET /api/items/
+    Fully supports:
+      - Multi-category (comma-separated)
+      - Multi-state & multi-city
+      - Full-text search in title + description
+      - Offer activity: `min_offers` filter and `sort` = recent | offers | best_price
+        (served from the denormalized Item.offer_count / Item.best_price, no join)
+      - Proper pagination response
+    """
+    filters = _item_filters(request.args)
+    sort = request.args.get("sort", "recent")
+
+    page = max(1, request.args.get("page", default=1, type=int))
+    page_size = min(100, max(1, request.args.get("page_size", default=20, type=int)))
+
+    if (sort == "recent" and filters == DEFAULT_FILTERS and current_app.config["HOME_FEED_ENABLED"]
+            and not reads_own_writes()):  # a client that just wrote must see its change
+        response = _home_feed_page(page, page_size)
+        if response is not None:
+            return response, 200
+
+    query = _filtered_items(filters)
 
     # ------------------------------
     # Execute with pagination
     # ------------------------------
+    if sort == "offers":
+        order_by = (Item.offer_count.desc(), Item.created_at.desc())
+    elif sort == "best_price":
+        order_by = (Item.best_price.desc().nulls_last(), Item.created_at.desc())
+    else:
+        order_by = (Item.created_at.desc(),)
+
     total_items = query.count()
 
     items = (
         query
-        .order_by(Item.created_at.desc())
+        .options(selectinload(Item.images))  # to_dict() needs them: one query for the page
+        .order_by(*order_by)
         .offset((page - 1) * page_size)
         .limit(page_size)
         .all()
@@ -332,7 +517,28 @@ def list_items():
         "total_pages": total_pages
     }), 200
 
+@item_bp.route("/facets", methods=["GET"])
+@query_budget(1)
+def item_facets():
+    """
+    GET /api/items/facets
+    ---------------------
+    Takes the filters of GET /api/items/ (categories, states, cities,
+    offer_type, owner_id, search, status, min_offers; paging and sort are
+    ignored) and returns how many matching items there are per value of
+    each filter, computed in one grouped query and cached per normalized
+    filter set (utils/facets.py).
+
+    **Response:**
+    - 200 OK with {"total", "categories": [{"id", "name", "count"}],
+                   "states": [{"value", "count"}], "cities": [{"state", "city", "count"}],
+                   "offer_types": [{"value", "count"}]}
+    """
+    filters = _item_filters(request.args)
+    return jsonify(cached_facets(filters, _filtered_items(filters))), 200
+
 @item_bp.route("/<int:item_id>", methods=["GET"])
+@query_budget(2)
 def get_item(item_id):
     """
     GET /api/items/<id>
@@ -357,7 +563,7 @@ def delete_item(item_id):
     The item’s status is set to `"cancelado"`.
     """
     user_id = int(get_jwt_identity())
-    user:User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         #has a jwt identity but its not registered on base
         return jsonify({"error": "not propperly logged in"}), 401
@@ -396,7 +602,7 @@ def upload_item_image(item_id):
     """
 
     user_id = int(get_jwt_identity())
-    user = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         return jsonify({"error": "not properly logged in"}), 401
 
@@ -429,6 +635,7 @@ def upload_item_image(item_id):
 
     db.session.add(new_img)
     db.session.commit()
+    IMAGES_UPLOADED.labels("upload").inc()
 
     return jsonify(new_img.to_dict()), 201
 
@@ -438,60 +645,32 @@ def upload_item_image(item_id):
 # 📘 Get available item categories
 # ============================================================
 @item_bp.route("/categories", methods=["GET"])
+@query_budget(1)
 def get_item_categories():
     """
     GET /api/items/categories
     -------------------------
-    Returns a list of valid categories for item creation and searching.
+    Returns the valid categories for item creation and searching, in
+    display order, with how many items are active ("ativo") in each.
+
+    Counts come from the in-memory copy in utils/categories.py (no query,
+    except the periodic reload), so they can trail other workers' writes
+    by up to CATEGORY_COUNTS_REFRESH_SECONDS.
 
-    Currently hardcoded, but in the future could be dynamic from db/redis.
+    They count by status only. The listing also hides "ativo" items whose
+    deadline has passed (`Item.is_valid`), so until the expiration checker
+    moves those out of "ativo" (every CHECK_INTERVAL_SECONDS), a count can
+    be higher than what GET /api/items/?categories=<name> returns.
 
     **Response:**
-    - 200 OK with {"categories": [...]}
+    - 200 OK with {"categories": [names...],
+                   "counts": [{"id", "name", "active_items"}, ...]}
     """
-    
-    categories = [
-        "Eletrônicos",
-        "Informática",
-        "Celulares e Acessórios",
-        "Games",
-        "Eletrodomésticos",
-        "Móveis",
-        "Decoração",
-        "Roupas",
-        "Calçados",
-        "Acessórios de Moda",
-        "Esporte e Lazer",
-        "Livros",
-        "Papelaria",
-        "Ferramentas",
-        "Construção",
-        "Automotivo",
-        "Bebês e Infantil",
-        "Brinquedos",
-        "Pet Shop",
-        "Saúde e Beleza",
-        "Perfumaria",
-        "Cozinha",
-        "Alimentos e Bebidas",
-        "Jardinagem",
-        "Colecionáveis",
-        "Instrumentos Musicais",
-        "Arte e Artesanato",
-        "Fotografia",
-        "Som e Áudio",
-        "Filmes e Séries",
-        "Casa Inteligente",
-        "Camping e Aventura",
-        "Relógios",
-        "Joias",
-        "Puzzles e Board Games",
-        "Papelaria e Escritório",
-        "Outros"
-    ]
-
-
-    return jsonify({"categories": categories}), 200
-
-
-
+    counts = category_counts.snapshot()
+    return jsonify({
+        "categories": ITEM_CATEGORIES,
+        "counts": [
+            {"id": CATEGORY_IDS[name], "name": name, "active_items": counts.get(CATEGORY_IDS[name], 0)}
+            for name in ITEM_CATEGORIES
+        ],
+    }), 200
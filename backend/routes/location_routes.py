@@ -1,8 +1,11 @@
 # routes/location_routes.py
+import logging
 from flask import Blueprint, jsonify, request
 from data.br_locations import BR_LOCATIONS
 from utils.location import is_valid_state
+from utils.compression import precompressed_json_response
 
+logger = logging.getLogger("itemhub.location")
 location_bp = Blueprint("location", __name__, url_prefix="/locations")
 
 # -----------------------------------------
@@ -14,8 +17,9 @@ def get_states():
     Returns all Brazilian state codes in alphabetical order.
     Example: ["AC", "AL", "AP", ...]
     """
-    states = sorted(BR_LOCATIONS.keys())
-    return jsonify(states), 200
+    return precompressed_json_response(
+        ("states",), lambda: sorted(BR_LOCATIONS.keys())
+    )
 
 
 # -----------------------------------------
@@ -29,7 +33,9 @@ def get_cities_single(state):
     state = state.upper()
     if not is_valid_state(state):
         return jsonify({"error": "Estado inválido ou não encontrado"}), 404
-    return jsonify(BR_LOCATIONS[state]), 200
+    return precompressed_json_response(
+        ("cities", state), lambda: BR_LOCATIONS[state]
+    )
 
 
 @location_bp.route("/cities", methods=["GET"])
@@ -45,11 +51,14 @@ def get_cities_multi():
     if not valid_states:
         return jsonify({"error": "Nenhum estado válido fornecido with a raw_states of "+  raw_states + ", and state_codes of "+ str(state_codes)}), 400
 
-    result = {state: BR_LOCATIONS[state] for state in valid_states}
-
     # Sempre retorna apenas o objeto com cidades → frontend nunca quebra
     if invalid_states:
-        # Opcional: log no servidor, mas não polui a resposta
-        print(f"[LOCATION] Estados ignorados: {', '.join(invalid_states)}")
-    
-    return jsonify(result), 200
\ No newline at end of file
+        # Opcional: log no servidor (amostrado, ver LOG_SAMPLING), mas não polui a resposta
+        logger.info("invalid states ignored", extra={"states": invalid_states[:20]})
+
+    # same states in any order or repeated -> one cache entry
+    states = tuple(sorted(set(valid_states)))
+    return precompressed_json_response(
+        ("cities_multi", *states),
+        lambda: {state: BR_LOCATIONS[state] for state in states}
+    )
\ No newline at end of file
@@ -0,0 +1,26 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from utils import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """
+    GET /metrics
+    ------------
+    Prometheus text format, aggregated over every gunicorn worker through
+    PROMETHEUS_MULTIPROC_DIR. Protected by METRICS_TOKEN when it is set.
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return jsonify({"error": "unauthorized"}), 401
+
+    if metrics.prometheus_client is None or not current_app.config["METRICS_ENABLED"]:
+        return jsonify({"error": "metrics disabled (install prometheus_client)"}), 501
+
+    body, content_type = metrics.render_latest()
+    return Response(body, content_type=content_type)
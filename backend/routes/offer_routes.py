@@ -1,22 +1,44 @@
+import logging
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from models import db, Offer, Item, User
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager
+from models import db, Offer, Item
 from datetime import datetime
+from utils.pagination import parse_limit, encode_cursor, decode_cursor
+from utils.identity import CurrentUser, resolve_current_user
+from utils.metrics import OFFERS_CREATED, OFFER_ACTIONS
+from utils.request_timing import query_budget
 
 offer_bp = Blueprint("offers", __name__)
+logger = logging.getLogger("itemhub.negotiation")
+
+LIVE_OFFER_INDEX = "uq_offers_user_item_live"
+
+
+def _is_duplicate_offer(exc: IntegrityError) -> bool:
+    """True when `exc` is a violation of the one-live-offer-per-user-per-item index."""
+    diag = getattr(exc.orig, "diag", None)  # psycopg2 names the violated constraint
+    if diag is not None and diag.constraint_name:
+        return diag.constraint_name == LIVE_OFFER_INDEX
+    # SQLite only names the columns
+    return "UNIQUE constraint failed: offers.user_id, offers.item_id" in str(exc.orig)
+
 
 # ============================================================
 # 📌 Create a new offer
 # ============================================================
 @offer_bp.route("/", methods=["POST"])
 @jwt_required()
+@query_budget(5)
 def create_offer():
     """
     Create a new offer (bid) on an existing item.
     """
     user_id = int(get_jwt_identity())
     # Fetch user AND ensure it exists
-    user = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         return jsonify({"error": "User not found"}), 401
     data = request.get_json()
@@ -43,12 +65,9 @@ def create_offer():
     if item.status in ["cancelado", "negociado", "expired"]:
         return jsonify({"error": f"Item is not available for offers ({item.status})"}), 400
 
-    # 🆕 Prevent duplicate offers from the same user for the same item
-    existing_offer = Offer.find_valid_user_offer_for_item(user_id, item.id)
-    if existing_offer:
-        return jsonify({"error": "You have already made an offer on this item"}), 400
-
     # Create offer
+    # (duplicates from the same user for the same item are rejected by the
+    # uq_offers_user_item_live partial unique index, see below)
     offer = Offer(
         user_id=user_id,
         user_name=user.username,   # ← NEW
@@ -60,8 +79,16 @@ def create_offer():
     )
 
     db.session.add(offer)
-    db.session.commit()
+    item.offer_added(offer.price)
+    try:
+        db.session.commit()
+    except IntegrityError as exc:
+        db.session.rollback()
+        if not _is_duplicate_offer(exc):
+            raise  # e.g. user or item deleted meanwhile: not the caller's duplicate
+        return jsonify({"error": "You have already made an offer on this item"}), 400
 
+    OFFERS_CREATED.inc()
     return jsonify(offer.to_dict()), 201
 
 
@@ -97,28 +124,91 @@ def get_offer_by_id(offer_id):
 # 📋 Get all offers for an item (with status filtering)
 # ============================================================
 @offer_bp.route("/item/<int:item_id>", methods=["GET"])
+@query_budget(2)
 def get_offers_for_item(item_id):
     """
-    Retrieve all offers for a given item, but only if their status
+    Retrieve the offers for a given item, but only if their status
     is in a predefined allowed list.
+
+    Query Parameters:
+        sort (str, optional): "recent" (default, newest first) or
+            "price" (highest price first).
+        limit (int, optional): page size (default 20, max 100).
+        cursor (str, optional): `next_cursor` from the previous page.
+        summary (bool, optional): when "1"/"true", returns only
+            {"count": int, "best_offer": {...} | null}.
+
+    Both sort orders are served by the composite indexes on
+    (item_id, status, created_at DESC) and (item_id, status, price DESC).
+
+    Returns:
+        200 OK: {"data": [...], "next_cursor": str|null, "limit": int}
+        400 Bad Request: invalid sort or cursor.
+        404 Not Found: item does not exist.
     """
 
     item = Item.query.get(item_id)
     if not item:
         return jsonify({"error": "Item not found"}), 404
 
+    base = Offer.query.filter(
+        Offer.item_id == item_id,
+        Offer.status.in_(Offer.allowed_statuses())
+    )
+
+    if request.args.get("summary") in ["1", "true"]:
+        # best offer + total in a single index scan (count as a window)
+        row = (
+            base
+                .add_columns(func.count().over().label("total"))
+                .order_by(Offer.price.desc(), Offer.id.desc())
+                .limit(1)
+                .first()
+        )
+        if not row:
+            return jsonify({"count": 0, "best_offer": None}), 200
+        best, total = row
+        return jsonify({"count": total, "best_offer": best.to_dict()}), 200
+
+    sort = request.args.get("sort", "recent")
+    if sort == "recent":
+        sort_columns = (Offer.created_at, Offer.id)
+        cursor_types = (datetime, int)
+    elif sort == "price":
+        sort_columns = (Offer.price, Offer.id)
+        cursor_types = (float, int)
+    else:
+        return jsonify({"error": "Invalid sort (use 'recent' or 'price')"}), 400
+
+    limit = parse_limit()
+
+    query = base
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            cursor_values = decode_cursor(cursor, cursor_types)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        query = query.filter(tuple_(*sort_columns) < tuple_(*cursor_values))
 
     offers = (
-        Offer.query
-             .filter(
-                 Offer.item_id == item_id,
-                 Offer.status.in_(Offer.allowed_statuses())
-             )
-             .order_by(Offer.created_at.desc())
-             .all()
+        query
+            .order_by(*[col.desc() for col in sort_columns])
+            .limit(limit + 1)
+            .all()
     )
 
-    return jsonify([o.to_dict() for o in offers]), 200
+    next_cursor = None
+    if len(offers) > limit:
+        offers = offers[:limit]
+        last = offers[-1]
+        next_cursor = encode_cursor(*[getattr(last, col.key) for col in sort_columns])
+
+    return jsonify({
+        "data": [o.to_dict() for o in offers],
+        "next_cursor": next_cursor,
+        "limit": limit
+    }), 200
 
 
 # ============================================================
@@ -126,38 +216,77 @@ def get_offers_for_item(item_id):
 # ============================================================
 @offer_bp.route("/my", methods=["GET"])
 @jwt_required()
+@query_budget(2)
 def get_my_offers():
     """
-    Returns all valid (active) offers made by the logged-in user.
+    Returns the valid (active) offers made by the logged-in user.
     Includes item data for each offer to support dashboard rendering.
+
+    Query Parameters:
+        status (str, optional): comma-separated subset of the allowed
+            statuses ("ativo", "pendendo_confirmacao").
+        limit (int, optional): page size (default 20, max 100).
+        cursor (str, optional): `next_cursor` from the previous page.
+
+    Items come from the same JOIN as the offers (contains_eager) and their
+    images are loaded in one extra SELECT ... IN, so a page always costs
+    two queries regardless of its size.
+
+    Returns:
+        200 OK: {"data": [{"offer": {...}, "item": {...}}], "next_cursor": str|null, "limit": int}
+        400 Bad Request: invalid status or cursor.
     """
 
     user_id = int(get_jwt_identity())
 
-    # Fetch offers
-    offers: list[Offer] = (
+    statuses = Offer.allowed_statuses()
+    raw_status = request.args.get("status", "")
+    if raw_status:
+        statuses = [s.strip() for s in raw_status.split(",") if s.strip()]
+        if not statuses or any(s not in Offer.allowed_statuses() for s in statuses):
+            return jsonify({"error": "Invalid status filter"}), 400
+
+    limit = parse_limit()
+
+    query = (
         Offer.query
-            .join(Offer.item)                     # <-- REQUIRED
+            .join(Offer.item)
+            .options(contains_eager(Offer.item).selectinload(Item.images))
             .filter(
                 Offer.user_id == user_id,
-                Offer.status.in_(Offer.allowed_statuses()),
+                Offer.status.in_(statuses),
                 Item.is_valid                     # <-- use Item.is_valid, NOT Offer.item.is_valid
             )
-            .order_by(Offer.created_at.desc())
+    )
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            created_at, offer_id = decode_cursor(cursor, (datetime, int))
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        query = query.filter(tuple_(Offer.created_at, Offer.id) < tuple_(created_at, offer_id))
+
+    # fetch one extra row to know whether there is a next page
+    offers: list[Offer] = (
+        query
+            .order_by(Offer.created_at.desc(), Offer.id.desc())
+            .limit(limit + 1)
             .all()
     )
 
+    next_cursor = None
+    if len(offers) > limit:
+        offers = offers[:limit]
+        next_cursor = encode_cursor(offers[-1].created_at, offers[-1].id)
 
     # Build response combining offer + item
-    result = []
-    for offer in offers:
-        item:Item = offer.item
-        result.append({
-            "offer": offer.to_dict(),
-            "item": item.to_dict() if item else None
-        })
+    result = [
+        {"offer": offer.to_dict(), "item": offer.item.to_dict()}
+        for offer in offers
+    ]
 
-    return jsonify(result), 200
+    return jsonify({"data": result, "next_cursor": next_cursor, "limit": limit}), 200
 
 
 # ============================================================
@@ -181,7 +310,7 @@ def cancel_offer(offer_id):
         200 OK on success, 403 if unauthorized, 404 if not found.
     """
     user_id = int(get_jwt_identity())
-    user:User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         #has a jwt identity but its not registered on base
         return jsonify({"error": "not propperly logged in"}), 401 
@@ -197,7 +326,9 @@ def cancel_offer(offer_id):
         return jsonify({"error": "Offer is not active and thus cant be cancelled"}), 400
 
     offer.status = "cancelado"
+    offer.item.offer_removed(offer.price)
     db.session.commit()
+    OFFER_ACTIONS.labels("cancel").inc()
 
     return jsonify({"message": "Offer cancelled successfully", "offer_id": offer_id}), 200
 
@@ -232,7 +363,7 @@ def confirm_offer(offer_id):
         400 if offer not in the correct status.
     """
     user_id = int(get_jwt_identity())
-    user:User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         #has a jwt identity but its not registered on base
         return jsonify({"error": "not propperly logged in"}), 401
@@ -255,7 +386,7 @@ def confirm_offer(offer_id):
         offer.bidder_confirmed = False
 
     # Identify who is confirming
-    if user_id == item.user_id:
+    if user_id == item.owner_id:
         offer.owner_confirmed = True
     elif user_id == offer.user_id:
         offer.bidder_confirmed = True
@@ -266,11 +397,14 @@ def confirm_offer(offer_id):
     if offer.owner_confirmed and offer.bidder_confirmed:
         offer.status = "negociado"
         item.status = "negociado"
+        item.refresh_offer_aggregates()
         db.session.commit()
-        print(f"[NEGOTIATION] Offer {offer.id} and item {item.id} finalized successfully.")
+        OFFER_ACTIONS.labels("finalize").inc()
+        logger.info("negotiation finalized", extra={"offer_id": offer.id, "item_id": item.id})
         return jsonify({"message": "Negotiation finalized successfully."}), 200
 
     db.session.commit()
+    OFFER_ACTIONS.labels("confirm").inc()
     return jsonify({"message": "Your confirmation was recorded. Waiting for the other party."}), 200
 
 
@@ -297,7 +431,7 @@ def decline_offer(offer_id):
         400 if offer not in pending state.
     """
     user_id = int(get_jwt_identity())
-    user:User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         #has a jwt identity but its not registered on base
         return jsonify({"error": "not propperly logged in"}), 401
@@ -314,14 +448,15 @@ def decline_offer(offer_id):
         return jsonify({"error": "Item not found"}), 404
 
     # Only parties involved can decline
-    if user_id not in [item.user_id, offer.user_id]:
+    if user_id not in [item.owner_id, offer.user_id]:
         return jsonify({"error": "You are not part of this negotiation"}), 403
 
     offer.status = "cancelado"
     item.status = "cancelado"
+    item.refresh_offer_aggregates()
     db.session.commit()
-
-    print(f"[NEGOTIATION] Offer {offer.id} declined. Item {item.id} cancelled.")
+    OFFER_ACTIONS.labels("decline").inc()
+    logger.info("negotiation declined", extra={"offer_id": offer.id, "item_id": item.id})
     return jsonify({"message": "Negotiation cancelled successfully."}), 200
 
 
@@ -355,7 +490,7 @@ def edit_offer(offer_id):
         409 Conflict (cannot edit due to state/rules)
     """
     user_id = int(get_jwt_identity())
-    user:User = User.get_by_id(user_id)
+    user: CurrentUser = resolve_current_user()
     if not user:
         #has a jwt identity but its not registered on base
         return jsonify({"error": "not propperly logged in"}), 401
@@ -386,10 +521,13 @@ def edit_offer(offer_id):
 
     if "price" in data:
         try:
-            offer.price = float(data["price"])
-            updated = True
+            new_price = float(data["price"])
         except (TypeError, ValueError):
             return jsonify({"error": "Invalid price value"}), 400
+        old_price = offer.price
+        offer.price = new_price
+        item.offer_price_changed(old_price, new_price)
+        updated = True
 
     if "message" in data:
         offer.message = data["message"]
@@ -399,5 +537,6 @@ def edit_offer(offer_id):
         return jsonify({"error": "No valid fields to update"}), 400
 
     db.session.commit()
+    OFFER_ACTIONS.labels("edit").inc()
 
     return jsonify(offer.to_dict()), 200
@@ -0,0 +1,66 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+
+from scheduler.offer_expiration_checker import CHECK_INTERVAL_SECONDS, check_expired_offers
+from utils.metrics import SCHEDULER_LAG, SCHEDULER_LAST_RUN
+
+logger = logging.getLogger("itemhub.scheduler")
+
+_lock_file = None
+_stop = threading.Event()
+
+
+def _acquire_lock(path: str) -> bool:
+    """
+    Non-blocking exclusive lock held for the life of the process, so only
+    one gunicorn worker (of any worker class) runs the scheduler.
+    """
+    global _lock_file
+    handle = open(path, "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return False
+    handle.write(str(os.getpid()))
+    handle.flush()
+    _lock_file = handle
+    return True
+
+
+def _run(app, interval: float):
+    # fixed-rate schedule: a pass that overruns shows up as lag on the next one
+    due = time.monotonic() + interval
+    while not _stop.wait(max(0.0, due - time.monotonic())):
+        started = time.monotonic()
+        SCHEDULER_LAG.set(max(0.0, started - due))
+        SCHEDULER_LAST_RUN.set(time.time())
+        due = started + interval
+        try:
+            check_expired_offers(app)
+        except Exception:  # keep the loop alive, next pass retries
+            logger.exception("expiration pass failed")
+
+
+def start_scheduler(app) -> bool:
+    """
+    Starts the expiration checker in a daemon thread if SCHEDULER_ENABLED
+    and no other process holds SCHEDULER_LOCK_FILE. Returns True if started.
+    """
+    if not app.config.get("SCHEDULER_ENABLED"):
+        return False
+    if _lock_file is not None:
+        return False  # already running in this process
+    if not _acquire_lock(app.config["SCHEDULER_LOCK_FILE"]):
+        return False
+
+    interval = app.config.get("SCHEDULER_INTERVAL_SECONDS", CHECK_INTERVAL_SECONDS)
+    thread = threading.Thread(
+        target=_run, args=(app, interval), name="offer-expiration-checker", daemon=True
+    )
+    thread.start()
+    logger.info("expiration checker started", extra={"pid": os.getpid(), "interval_s": interval})
+    return True
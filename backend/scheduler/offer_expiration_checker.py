@@ -1,10 +1,13 @@
-import threading
+import logging
 import time
 from datetime import datetime
 from models import db, Item, Offer
+from utils.metrics import EXPIRATION_PASS_DURATION, ITEMS_EXPIRED
 
 CHECK_INTERVAL_SECONDS = 300  # 5 minutes
 
+logger = logging.getLogger("itemhub.offer_checker")
+
 def check_expired_offers(app):
     """
     Periodically checks for expired item offers and updates their status.
@@ -16,9 +19,11 @@ def check_expired_offers(app):
         * If no offers → mark item.status = "expired".
     - All offers belonging to expired items are also locked from new changes.
 
-    This function runs continuously in a background thread.
+    Runs a single pass; `scheduler.start_scheduler` calls it every
+    CHECK_INTERVAL_SECONDS from a background thread.
     It uses the Flask app context to safely interact with the database.
     """
+    started = time.perf_counter()
     with app.app_context():
         now = datetime.utcnow()
         expired_items = Item.query.filter(
@@ -27,23 +32,37 @@ def check_expired_offers(app):
         ).all()
 
         for item in expired_items:
-            offers = Offer.query.filter_by(item_id=item.id, status="active").all()
-
-            if not offers:
+            if not item.offer_count:
+                # denormalized counter, no need to query offers
                 item.status = "espirado"
-                print(f"[OFFER CHECKER] Item {item.id} expired with no offers.")
+                ITEMS_EXPIRED.labels("no_offers").inc()
+                logger.info("item expired with no offers", extra={"item_id": item.id})
             else:
-                # Select the "best" offer based on amount value
+                # Select the "best" offer based on price
                 # (highest offer wins if positive, lowest absolute value if negative)
-                winning_offer = sorted(offers, key=lambda o: o.amount, reverse=True)[0]
-
-                item.status = "pendendo_confirmacao"
-                winning_offer.status = "pendendo_confirmacao"
+                winning_offer = (
+                    Offer.query
+                        .filter(Offer.item_id == item.id, Offer.status == "ativo")
+                        .order_by(Offer.price.desc(), Offer.id)
+                        .first()
+                )
 
-                print(f"[OFFER CHECKER] Item {item.id} expired → "
-                      f"Offer {winning_offer.id} set as pending confirmation.")
+                if winning_offer is None:
+                    # aggregates were stale; fix them while we are here
+                    item.status = "espirado"
+                    item.refresh_offer_aggregates()
+                    ITEMS_EXPIRED.labels("no_offers").inc()
+                    logger.info("item expired with no offers", extra={"item_id": item.id})
+                else:
+                    # the winner stays in the live set, so the aggregates are unchanged
+                    item.status = "pendendo_confirmacao"
+                    winning_offer.status = "pendendo_confirmacao"
+                    ITEMS_EXPIRED.labels("pending_confirmation").inc()
+                    logger.info(
+                        "item expired, best offer pending confirmation",
+                        extra={"item_id": item.id, "offer_id": winning_offer.id},
+                    )
 
             db.session.commit()
 
-    # Schedule next run
-    threading.Timer(CHECK_INTERVAL_SECONDS, check_expired_offers, args=[app]).start()
+    EXPIRATION_PASS_DURATION.observe(time.perf_counter() - started)
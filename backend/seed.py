@@ -5,62 +5,18 @@ import os
 import random
 from datetime import datetime, timedelta
 
-from psycopg2 import OperationalError, ProgrammingError
-from app import create_app, db
-from models import User, Item, ItemImage, Offer
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from data.categories import ITEM_CATEGORIES
+from models import db, User, Item, ItemImage, Offer
 from werkzeug.security import generate_password_hash
 
 
-
-print("[SEED] Iniciando seed.py atualizado (com usuário fixo + imagens coerentes)")
-
 # ========================
 # DADOS MOCK REALISTAS
 # ========================
 FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João"]
 LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Costa", "Pereira", "Lima", "Ferreira", "Almeida", "Ribeiro"]
 
-CATEGORIES = [
-        "Eletrônicos",
-        "Informática",
-        "Celulares e Acessórios",
-        "Games",
-        "Eletrodomésticos",
-        "Móveis",
-        "Decoração",
-        "Roupas",
-        "Calçados",
-        "Acessórios de Moda",
-        "Esporte e Lazer",
-        "Livros",
-        "Papelaria",
-        "Ferramentas",
-        "Construção",
-        "Automotivo",
-        "Bebês e Infantil",
-        "Brinquedos",
-        "Pet Shop",
-        "Saúde e Beleza",
-        "Perfumaria",
-        "Cozinha",
-        "Alimentos e Bebidas",
-        "Jardinagem",
-        "Colecionáveis",
-        "Instrumentos Musicais",
-        "Arte e Artesanato",
-        "Fotografia",
-        "Som e Áudio",
-        "Filmes e Séries",
-        "Casa Inteligente",
-        "Camping e Aventura",
-        "Relógios",
-        "Joias",
-        "Puzzles e Board Games",
-        "Papelaria e Escritório",
-        "Outros"
-    ]
-
-
 
 VALID_LOCATIONS = {
     "São Paulo": ["São Paulo", "Campinas", "Santos", "Guarulhos", "Sorocaba", "Ribeirão Preto"],
@@ -114,9 +70,7 @@ TITLES = {
 }
 
 def seed_database(app):
-    print("Entrou em seed_database()")
     with app.app_context():
-        print("Dentro do app context")
 
         # Verifica se já tem dados
         try:
@@ -130,15 +84,17 @@ def seed_database(app):
             
         print("Iniciando seed com usuário fixo e imagens coerentes...")
 
+        # todos os usuários usam a mesma senha: um hash só
+        password_hash = generate_password_hash("123456")
+
         # ====================
         # 1. USUÁRIO FIXO DE TESTE
         # ====================
-        print("Criando usuário fixo de teste...")
         user_teste = User(
             username="teste",
             email="teste@teste.com",
             full_name="Usuário de Teste",
-            password_hash=generate_password_hash("123456")
+            password_hash=password_hash
         )
         db.session.add(user_teste)
         db.session.flush()  # pra garantir o ID
@@ -162,7 +118,7 @@ def seed_database(app):
             full_name = f"{first} {last}"
             email = f"{username}@exemplo.com"
             user = User(username=username, email=email, full_name=full_name,
-                        password_hash=generate_password_hash("123456"))
+                        password_hash=password_hash)
             db.session.add(user)
             users.append(user)
 
@@ -196,7 +152,7 @@ def seed_database(app):
                 owner_username=owner.username,
                 title=title,
                 description="Item em bom estado. Retirar o mais rápido possível. Contato via chat.",
-                category=random.choice(CATEGORIES),
+                category=random.choice(ITEM_CATEGORIES),
                 offer_type=offer_type,
                 volume=round(random.uniform(0.2, 8.0), 2),
                 state=state,
@@ -240,41 +196,29 @@ def seed_database(app):
         # --------------------
         # 4. Criar ofertas 
         # --------------------
-        print("[DEBUG] Início da criação de ofertas")
         offers_created = 0
         for attempt in range(2000):
-            print(f"[DEBUG] Tentativa de criar oferta {attempt+1}/2000 (atualmente {offers_created}/50 criadas)")
-
             if offers_created >= 50:
-                print("[DEBUG] Limite de 50 ofertas alcançado.")
                 break
 
             item = random.choice(items)
-            print(f"[DEBUG] item escolhido ID={item.id}, status={item.status}")
 
             if item.status != "ativo":
-                print("[DEBUG] Item não ativo. Ignorando.")
                 continue
 
             if item.is_expired():
-                print("[DEBUG] Item expirado. Ignorando.")
                 continue
 
             possible_bidders = [u for u in users if u.id != item.owner_id]
-            print(f"[DEBUG] Total possible bidders: {len(possible_bidders)}")
 
             if not possible_bidders:
-                print("[DEBUG] Nenhum bidder possível. Pulando.")
                 continue
 
             bidder = random.choice(possible_bidders)
-            print(f"[DEBUG] Bidder selecionado: {bidder.username}")
 
             existing = Offer.find_valid_user_offer_for_item(bidder.id, item.id)
-            print(f"[DEBUG] existing_offer = {existing}")
 
             if existing:
-                print("[DEBUG] Usuário já fez oferta válida neste item. Pulando.")
                 continue
 
             # Determinar preço
@@ -285,8 +229,6 @@ def seed_database(app):
             else:
                 price = round(random.uniform(-400, -50), 2)
 
-            print(f"[DEBUG] price definido: {price}")
-
             messages = [
                 "Tenho interesse! Posso buscar amanhã?",
                 "Ainda está disponível?",
@@ -297,7 +239,6 @@ def seed_database(app):
             ]
 
             msg = random.choice(messages)
-            print(f"[DEBUG] Mensagem escolhida: {msg}")
 
             created_time = datetime.now() - timedelta(days=random.randint(0, 10))
 
@@ -310,12 +251,11 @@ def seed_database(app):
                 status="ativo",
                 created_at=created_time
             )
-            print(f"[DEBUG] Criando Offer user={bidder.id}, item={item.id}, price={price}")
 
             db.session.add(offer)
+            item.offer_added(price)
             offers_created += 1
 
-        print("[DEBUG] Commit das ofertas...")
         db.session.commit()
 
         print(f"{offers_created} ofertas criadas com sucesso")
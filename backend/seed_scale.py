@@ -0,0 +1,339 @@
+# ============================================
+# Synthetic data at scale (flask seed --users/--items/--offers)
+# ============================================
+"""
+Generates large, deterministic datasets for benchmarking.
+
+- Rows are produced in fixed-size chunks; each chunk has its own RNG derived
+  from (--seed, table, chunk number), so the data is the same no matter how
+  many worker processes run.
+- Primary keys are assigned up front (after the current MAX(id)), so items,
+  images and offers can reference each other without reading anything back.
+- Postgres gets COPY ... FROM STDIN; other databases a multi-row INSERT.
+- Every user shares one precomputed password hash.
+- Locations are drawn uniformly over the real (state, city) pairs in
+  BR_LOCATIONS, so states weigh as much as their number of cities.
+- Item aggregates (offer_count / best_price) are computed while generating
+  the item's offers, so no reconcile pass is needed.
+- Items already past their deadline are written the way the expiration
+  checker leaves them (espirado, or pendendo_confirmacao + winning offer),
+  as if it had been running all along.
+"""
+import csv
+import io
+import multiprocessing
+import random
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from flask import current_app
+from sqlalchemy import create_engine, text
+from werkzeug.security import generate_password_hash
+
+from data.br_locations import BR_LOCATIONS
+from data.categories import CATEGORY_IDS, ITEM_CATEGORIES
+
+SEED_PASSWORD = "123456"
+LIVE_OFFER_STATUSES = ("ativo", "pendendo_confirmacao")
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João"]
+LAST_NAMES = ["Silva", "Santos", "Oliveira", "Souza", "Costa", "Pereira", "Lima", "Ferreira", "Almeida", "Ribeiro"]
+IMAGES = [
+    "sofa-cinza.jpg", "geladeira-inox.jpg", "tv-55-oled.jpg", "bicicleta-caloi.jpg",
+    "iphone-13.jpg", "notebook-gamer.jpg", "cama-casal.jpg", "mesa-jantar.jpg",
+    "ps5.jpg", "fritadeira.jpg",
+]
+TITLES = {
+    "free": ["Sofá 3 lugares", "Geladeira funcionando", "Cama box casal", "Guarda-roupa 6 portas"],
+    "pay": ["iPhone 13 128GB", "MacBook Air M1", "PS5 + 2 controles", "Bicicleta Caloi aro 29"],
+    "paid_to_take": ["Pago pra levarem entulho", "Levem sofá velho", "Geladeira quebrada"],
+}
+OFFER_TYPES = ["free", "pay", "paid_to_take"]
+OFFER_TYPE_WEIGHTS = [45, 35, 20]
+DURATIONS = [1, 7, 15, 30]
+MESSAGES = ["Tenho interesse!", "Ainda está disponível?", "Posso buscar amanhã?", "Posso passar aí sábado?"]
+
+USER_COLUMNS = ["id", "username", "email", "password_hash", "full_name", "created_at", "account_version"]
+ITEM_COLUMNS = [
+    "id", "owner_id", "owner_username", "title", "description", "category", "category_id", "image_url",
+    "offer_type", "volume", "state", "city", "address", "duration_days", "created_at",
+    "status", "offer_count", "best_price",
+]
+IMAGE_COLUMNS = ["item_id", "image_url", "position", "enabled"]
+OFFER_COLUMNS = [
+    "user_id", "user_name", "item_id", "price", "message", "status", "created_at",
+    "owner_confirmed", "bidder_confirmed",
+]
+
+
+def _username(user_id: int) -> str:
+    # derived from the id so items/offers can name their user without a lookup
+    return f"user{user_id}"
+
+
+def _chunk_rng(seed: int, kind: str, chunk_no: int) -> random.Random:
+    return random.Random(f"{seed}:{kind}:{chunk_no}")
+
+
+class _Locations:
+    """Uniform over the real (state, city) pairs."""
+
+    def __init__(self):
+        self.states = list(BR_LOCATIONS)
+        self.cum_weights = list(accumulate(len(BR_LOCATIONS[s]) for s in self.states))
+
+    def pick(self, rng: random.Random):
+        idx = rng.randrange(self.cum_weights[-1])
+        s = bisect_right(self.cum_weights, idx)
+        cities = BR_LOCATIONS[self.states[s]]
+        start = self.cum_weights[s - 1] if s else 0
+        return self.states[s], cities[idx - start]
+
+
+# -----------------------------------------
+# Row generators (pure: same arguments -> same rows)
+# -----------------------------------------
+
+def _user_rows(first_id, count, seed, chunk_no, password_hash, now):
+    rng = _chunk_rng(seed, "users", chunk_no)
+    for user_id in range(first_id, first_id + count):
+        username = _username(user_id)
+        yield (
+            user_id, username, f"{username}@exemplo.com", password_hash,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            now - timedelta(seconds=rng.randrange(365 * 86400)), 1,
+        )
+
+
+def _item_rows(first_id, count, offers, user_range, seed, chunk_no, now):
+    """Returns (items, images, offers) for items [first_id, first_id + count)."""
+    rng = _chunk_rng(seed, "items", chunk_no)
+    locations = _Locations()
+    first_user, n_users = user_range
+
+    # spread this chunk's offers over its items
+    per_item = [0] * count
+    for _ in range(offers):
+        per_item[rng.randrange(count)] += 1
+
+    items, images, offer_rows = [], [], []
+    for n, item_id in enumerate(range(first_id, first_id + count)):
+        # a few heavy sellers own a large share of the items
+        owner_id = first_user + int(n_users * rng.random() ** 2)
+        offer_type = rng.choices(OFFER_TYPES, OFFER_TYPE_WEIGHTS)[0]
+        state, city = locations.pick(rng)
+        created_at = now - timedelta(seconds=rng.randrange(45 * 86400))
+        status = "cancelado" if rng.random() < 0.03 else "ativo"
+
+        n_images = rng.randint(1, 4)
+        picked = [rng.choice(IMAGES) for _ in range(n_images)]
+        for pos, img in enumerate(picked):
+            images.append((item_id, f"/items/image/{img}", pos, True))
+
+        bidders = rng.sample(range(first_user, first_user + n_users), min(per_item[n], n_users))
+        live_count, best_price, winner = 0, None, None
+        for bidder in bidders:
+            if bidder == owner_id:
+                continue
+            if offer_type == "free":
+                price = 0.0
+            elif offer_type == "pay":
+                price = round(rng.uniform(80, 1800), 2)
+            else:
+                price = round(rng.uniform(-400, -50), 2)
+            offer_status = "cancelado" if rng.random() < 0.1 else "ativo"
+            if offer_status in LIVE_OFFER_STATUSES:
+                live_count += 1
+                if best_price is None or price > best_price:
+                    best_price, winner = price, len(offer_rows)
+            offer_rows.append([
+                bidder, _username(bidder), item_id, price, rng.choice(MESSAGES), offer_status,
+                created_at + timedelta(seconds=rng.randrange(86400)), False, False,
+            ])
+
+        duration = rng.choice(DURATIONS)
+        if status == "ativo" and created_at + timedelta(days=duration) <= now:
+            # already past its deadline: leave it as the expiration checker would
+            if winner is None:
+                status = "espirado"
+            else:
+                status = "pendendo_confirmacao"
+                offer_rows[winner][5] = "pendendo_confirmacao"
+
+        category = rng.choice(ITEM_CATEGORIES)
+        items.append((
+            item_id, owner_id, _username(owner_id),
+            f"{rng.choice(TITLES[offer_type])} #{item_id}",
+            "Item em bom estado. Retirar o mais rápido possível.",
+            category, CATEGORY_IDS[category], f"/items/image/{picked[0]}",
+            offer_type, round(rng.uniform(0.2, 8.0), 2), state, city,
+            f"Rua Exemplo {rng.randint(50, 999)}, Centro, {city} - {state}",
+            duration, created_at, status, live_count, best_price,
+        ))
+
+    return items, images, offer_rows
+
+
+# -----------------------------------------
+# Writers
+# -----------------------------------------
+
+def _copy_rows(raw_conn, table, columns, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(["\\N" if v is None else v for v in row])
+    buf.seek(0)
+    with raw_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf
+        )
+
+
+def _write(engine, batches):
+    """batches: [(table, columns, rows)], written in one transaction."""
+    if engine.dialect.name == "postgresql":
+        raw = engine.raw_connection()
+        try:
+            for table, columns, rows in batches:
+                if rows:
+                    _copy_rows(raw, table, columns, rows)
+            raw.commit()
+        finally:
+            raw.close()
+        return
+
+    with engine.begin() as conn:
+        for table, columns, rows in batches:
+            if rows:
+                stmt = text(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(':' + c for c in columns)})"
+                )
+                conn.execute(stmt, [dict(zip(columns, row)) for row in rows])
+
+
+# -----------------------------------------
+# Worker entry points (module-level so they can be pickled)
+# -----------------------------------------
+
+_engine = None
+
+
+def _worker_engine(uri):
+    global _engine
+    if _engine is None:
+        _engine = create_engine(uri)
+    return _engine
+
+
+def _users_chunk(uri, first_id, count, seed, chunk_no, password_hash, now):
+    rows = list(_user_rows(first_id, count, seed, chunk_no, password_hash, now))
+    _write(_worker_engine(uri), [("users", USER_COLUMNS, rows)])
+    return "users", len(rows), 0, 0
+
+
+def _items_chunk(uri, first_id, count, offers, user_range, seed, chunk_no, now):
+    items, images, offers_rows = _item_rows(first_id, count, offers, user_range, seed, chunk_no, now)
+    _write(_worker_engine(uri), [
+        ("items", ITEM_COLUMNS, items),
+        ("item_images", IMAGE_COLUMNS, images),
+        ("offers", OFFER_COLUMNS, offers_rows),
+    ])
+    return "items", len(items), len(images), len(offers_rows)
+
+
+# -----------------------------------------
+# Driver
+# -----------------------------------------
+
+def _split(total, size):
+    """[(offset, count)] covering range(total) in chunks of `size`."""
+    return [(start, min(size, total - start)) for start in range(0, total, size)]
+
+
+def _run(tasks, workers, log):
+    created = {"users": 0, "items": 0, "images": 0, "offers": 0}
+
+    def record(result):
+        kind, rows, images, offers = result
+        created[kind] += rows
+        created["images"] += images
+        created["offers"] += offers
+        log(f"  {kind}: {created[kind]} / images: {created['images']} / offers: {created['offers']}")
+
+    if workers <= 1:
+        for fn, args in tasks:
+            record(fn(*args))
+        return created
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for future in [pool.submit(fn, *args) for fn, args in tasks]:
+            record(future.result())
+    return created
+
+
+def seed_at_scale(db, users, items, offers, seed=42, workers=1, chunk_size=10000, log=print):
+    """
+    Appends `users` users and `items` items (with images and ~`offers` offers)
+    to the database bound to `db`. Items and offers only reference the users
+    created by the same run. Call inside an app context.
+    """
+    if items and users < 2:
+        raise ValueError("items need at least 2 users (one owner, one bidder)")
+
+    config = current_app.config
+    password_hash = generate_password_hash(
+        SEED_PASSWORD, method=config["PASSWORD_HASH_METHOD"], salt_length=config["PASSWORD_SALT_LENGTH"]
+    )
+
+    engine = db.engine
+    uri = engine.url.render_as_string(hide_password=False)
+    now = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    started = time.perf_counter()
+
+    first_user = _max_id(db, "users") + 1
+    user_tasks = [
+        (_users_chunk, (uri, first_user + off, cnt, seed, n, password_hash, now))
+        for n, (off, cnt) in enumerate(_split(users, chunk_size))
+    ]
+
+    first_item = _max_id(db, "items") + 1
+    item_tasks = [
+        (_items_chunk, (uri, first_item + off, cnt,
+                        offers * (off + cnt) // items - offers * off // items,  # this chunk's share
+                        (first_user, users), seed, n, now))
+        for n, (off, cnt) in enumerate(_split(items, chunk_size))
+    ]
+
+    db.session.close()
+    engine.dispose()  # never hand pooled connections to child processes
+
+    log(f"Gerando {users} usuários, {items} itens, ~{offers} ofertas (seed={seed}, workers={workers})")
+    created = _run(user_tasks, workers, log)   # users first: items reference them
+    for key, value in _run(item_tasks, workers, log).items():
+        created[key] += value
+
+    _after_load(db)
+    log(f"Concluído em {time.perf_counter() - started:.1f}s: {created}")
+    return created
+
+
+def _max_id(db, table):
+    return db.session.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar()
+
+
+def _after_load(db):
+    """Explicit ids bypass the Postgres sequences; move them past the new rows."""
+    if db.engine.dialect.name != "postgresql":
+        return
+    for table in ("users", "items", "item_images", "offers"):
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {table}), false)"
+        ))
+        db.session.execute(text(f"ANALYZE {table}"))
+    db.session.commit()
@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# before the app (and Config) are imported
+_db_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_file.name}"
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-long-enough-for-hs256")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+os.environ.setdefault("METRICS_ENABLED", "0")
+os.environ.setdefault("SLOW_QUERY_MS", "0")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("QUERY_BUDGET_ENFORCE", "1")  # a view over its @query_budget fails the test
+
+
+@pytest.fixture()
+def app():
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    app.config.update(TESTING=True, UPLOAD_FOLDER=tempfile.mkdtemp())
+    with app.app_context():
+        db.create_all(bind_key=None)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture()
+def replica_app(monkeypatch):
+    """The app with a "replica" bind on its own empty database: reads routed there miss the primary's rows."""
+    from app import create_app
+    from config import Config
+    from models import db
+
+    replica_file = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
+    monkeypatch.setattr(Config, "DATABASE_REPLICA_URL", f"sqlite:///{replica_file.name}")
+    app = create_app()
+    app.config.update(TESTING=True, UPLOAD_FOLDER=tempfile.mkdtemp())
+    with app.app_context():
+        db.create_all(bind_key=None)
+        db.metadata.create_all(db.engines["replica"])
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.metadata.drop_all(db.engines["replica"])
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def login(app, client):
+    """login(user_id): the test client sends that user's JWT cookie from now on."""
+    from flask_jwt_extended import create_access_token
+
+    def _login(user_id):
+        with app.app_context():
+            token = create_access_token(identity=str(user_id))
+        client.set_cookie(app.config.get("JWT_ACCESS_COOKIE_NAME", "access_token_cookie"), token)
+        return client
+    return _login
+
+
+class StatementCounter:
+    """Counts SQL statements sent on any engine while active."""
+
+    def __init__(self):
+        self.count = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        from sqlalchemy.engine import Engine
+        event.remove(Engine, "before_cursor_execute", self._on_execute)
+
+
+@pytest.fixture()
+def count_statements():
+    return StatementCounter
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.bulk_import import validate_rows
+
+GOOD_ROW = {
+    "title": "Sofá", "category": "Móveis", "duration_days": 7,
+    "state": "Acre", "city": "Xapuri", "description": "ok", "address": "Rua A",
+}
+
+
+def test_valid_row_passes(app):
+    valid, errors = validate_rows([dict(GOOD_ROW)], {})
+    assert errors == {}
+    assert valid[0][1]["category_id"] is not None
+
+
+@pytest.mark.parametrize("field, value", [
+    ("address", 123),
+    ("description", {"nested": True}),
+    ("title", 5),
+    ("category", ["Móveis"]),
+    ("offer_type", 1.5),
+    ("state", {"uf": "AC"}),
+    ("city", 42),
+])
+def test_wrong_type_is_a_row_error(app, field, value):
+    valid, errors = validate_rows([{**GOOD_ROW, field: value}], {})
+    assert valid == []
+    assert f"Invalid {field}" in errors[0]
+
+
+@pytest.mark.parametrize("images", [[{"name": "a.jpg"}], [1, 2], {"a": 1}, [["a.jpg"]]])
+def test_non_string_image_names_are_a_row_error(app, images):
+    valid, errors = validate_rows([{**GOOD_ROW, "images": images}], {"a.jpg": object()})
+    assert valid == []
+    assert errors[0] == ["Invalid images"]
+
+
+def test_bad_rows_do_not_affect_good_ones(app):
+    valid, errors = validate_rows([{**GOOD_ROW, "address": 1}, dict(GOOD_ROW)], {})
+    assert [idx for idx, _, _ in valid] == [1]
+    assert list(errors) == [0]
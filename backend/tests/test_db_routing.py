@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import event
+
+from models import db, User
+from utils.db_routing import REPLICA_BIND, STICKY_COOKIE
+
+
+@pytest.fixture()
+def statements_by_engine(replica_app):
+    """{"primary": n, "replica": n}: statements sent to each engine so far."""
+    counts = {"primary": 0, "replica": 0}
+    with replica_app.app_context():
+        engines = {"primary": db.engines[None], "replica": db.engines[REPLICA_BIND]}
+    listeners = []
+    for name, engine in engines.items():
+        def count(*args, name=name, **kwargs):
+            counts[name] += 1
+        event.listen(engine, "before_cursor_execute", count)
+        listeners.append((engine, count))
+    yield counts
+    for engine, count in listeners:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture()
+def routing_client(replica_app):
+    replica_app.config["HOME_FEED_ENABLED"] = False  # the listing must hit the session
+    return replica_app.test_client()
+
+
+def _register(client, name="alice"):
+    return client.post("/api/auth/register", json={
+        "username": name, "email": f"{name}@x.com", "password": "secret123",
+    })
+
+
+def test_writes_go_to_the_primary(replica_app, routing_client, statements_by_engine):
+    response = _register(routing_client)
+
+    assert response.status_code == 201, response.get_json()
+    assert statements_by_engine["replica"] == 0
+    assert statements_by_engine["primary"] > 0
+    with replica_app.app_context():
+        assert db.session.scalar(db.select(User.username)) == "alice"  # outside a request: primary
+        with db.engines[REPLICA_BIND].connect() as conn:
+            assert conn.scalar(db.select(db.func.count(User.id))) == 0
+
+
+def test_reads_go_to_the_replica(routing_client, statements_by_engine):
+    response = routing_client.get("/api/items/")
+
+    assert response.status_code == 200
+    assert statements_by_engine["primary"] == 0
+    assert statements_by_engine["replica"] > 0
+    assert STICKY_COOKIE not in response.headers.get("Set-Cookie", "")
+
+
+def test_reads_after_an_own_write_stick_to_the_primary(replica_app, routing_client, statements_by_engine):
+    response = _register(routing_client)
+    assert STICKY_COOKIE in response.headers["Set-Cookie"]
+
+    statements_by_engine.update(primary=0, replica=0)
+    assert routing_client.get("/api/items/").status_code == 200
+    assert statements_by_engine["replica"] == 0
+    assert statements_by_engine["primary"] > 0
+
+    other = replica_app.test_client()  # a client without the cookie still reads the replica
+    statements_by_engine.update(primary=0, replica=0)
+    assert other.get("/api/items/").status_code == 200
+    assert statements_by_engine["primary"] == 0
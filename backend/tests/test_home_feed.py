@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from models import db, User, Item, ItemImage
+from utils.home_feed import home_feed
+
+
+def _seed_items(count=3):
+    owner = User(username="owner", email="owner@x.com", password_hash="x")
+    db.session.add(owner)
+    db.session.flush()
+    now = datetime.utcnow()
+    for n in range(count):
+        item = Item(
+            owner_id=owner.id, owner_username=owner.username, title=f"Item {n} – ação",
+            category="Móveis", offer_type="free", state="Acre", city="Xapuri",
+            duration_days=7, created_at=now - timedelta(hours=n),
+        )
+        item.images = [ItemImage(image_url=f"/items/image/{n}.jpg", position=0)]
+        db.session.add(item)
+    db.session.commit()
+
+
+def test_feed_response_matches_database_response(app, client):
+    with app.app_context():
+        _seed_items()
+
+    app.config["HOME_FEED_ENABLED"] = False
+    from_database = client.get("/api/items/?page_size=2")
+    app.config["HOME_FEED_ENABLED"] = True
+    from_feed = client.get("/api/items/?page_size=2")
+
+    assert from_feed.status_code == from_database.status_code == 200
+    assert from_feed.get_data() == from_database.get_data()
+    assert b'": ' not in from_feed.get_data()
+
+
+def test_feed_reads_the_primary(replica_app):
+    with replica_app.app_context():
+        _seed_items()
+    client = replica_app.test_client()
+
+    replica_app.config["HOME_FEED_ENABLED"] = False
+    assert client.get("/api/items/").get_json()["total_items"] == 0  # the replica has not caught up
+
+    replica_app.config["HOME_FEED_ENABLED"] = True
+    body = client.get("/api/items/").get_json()
+    assert body["total_items"] == 3
+    assert [item["title"] for item in body["items"]] == [f"Item {n} – ação" for n in range(3)]
+
+
+def test_committed_changes_are_reloaded_from_the_primary(replica_app):
+    with replica_app.app_context():
+        _seed_items()
+    client = replica_app.test_client()
+    assert client.get("/api/items/").get_json()["total_items"] == 3
+
+    with replica_app.app_context():
+        item = db.session.scalars(db.select(Item).order_by(Item.created_at.desc())).first()
+        item.title = "Renamed"
+        db.session.commit()
+    assert home_feed._dirty
+
+    body = client.get("/api/items/").get_json()
+    assert body["items"][0]["title"] == "Renamed"
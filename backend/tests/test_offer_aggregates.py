@@ -0,0 +1,98 @@
+import pytest
+
+from models import db, User, Item, Offer
+
+
+@pytest.fixture()
+def users_and_item(app):
+    """(owner id, [bidder ids], item id): an active item without offers."""
+    with app.app_context():
+        owner = User(username="owner", email="owner@x.com", password_hash="x")
+        bidders = [User(username=f"bidder{n}", email=f"bidder{n}@x.com", password_hash="x") for n in range(2)]
+        db.session.add_all([owner, *bidders])
+        db.session.flush()
+        item = Item(
+            owner_id=owner.id, owner_username=owner.username, title="Sofá", category="Móveis",
+            offer_type="pay", state="Acre", city="Xapuri", duration_days=7,
+        )
+        db.session.add(item)
+        db.session.commit()
+        return owner.id, [bidder.id for bidder in bidders], item.id
+
+
+def _aggregates(item_id):
+    db.session.expire_all()
+    item = db.session.get(Item, item_id)
+    return item.offer_count, item.best_price
+
+
+def _add_offer(item, user_id, price):
+    offer = Offer(user_id=user_id, user_name="x", item_id=item.id, price=price, status="ativo")
+    db.session.add(offer)
+    item.offer_added(price)
+    return offer
+
+
+@pytest.mark.parametrize("prices", [(10.0, 20.0), (20.0, 10.0)])
+def test_two_offers_added_before_the_flush(app, users_and_item, prices):
+    _, bidders, item_id = users_and_item
+    with app.app_context():
+        item = db.session.get(Item, item_id)
+        for bidder_id, price in zip(bidders, prices):
+            _add_offer(item, bidder_id, price)
+        db.session.commit()
+
+        assert _aggregates(item_id) == (2, 20.0)
+
+
+def test_offer_removed_after_an_unflushed_add(app, users_and_item):
+    _, bidders, item_id = users_and_item
+    with app.app_context():
+        item = db.session.get(Item, item_id)
+        _add_offer(item, bidders[0], 10.0)
+        db.session.commit()
+
+        best = _add_offer(item, bidders[1], 30.0)
+        best.status = "cancelado"
+        item.offer_removed(30.0)  # best_price is still the pending case() here
+        db.session.commit()
+
+        assert _aggregates(item_id) == (1, 10.0)
+
+
+def test_routes_keep_aggregates_equal_to_a_reconcile(app, client, login, users_and_item):
+    owner_id, (first, second), item_id = users_and_item
+
+    def assert_reconciled():
+        with app.app_context():
+            maintained = _aggregates(item_id)
+        result = app.test_cli_runner().invoke(args=["reconcile-offer-aggregates"])
+        assert result.exit_code == 0, result.output
+        with app.app_context():
+            assert _aggregates(item_id) == maintained
+
+    offers = {}
+    for bidder_id, price in ((first, 10), (second, 25)):
+        response = login(bidder_id).post("/api/offers/", json={"item_id": item_id, "price": price})
+        assert response.status_code == 201
+        offers[bidder_id] = response.get_json()["id"]
+    assert_reconciled()
+
+    assert login(second).put(f"/api/offers/{offers[second]}", json={"price": 15}).status_code == 200
+    assert_reconciled()
+    assert login(first).put(f"/api/offers/{offers[first]}", json={"price": 30}).status_code == 200
+    assert_reconciled()
+
+    assert login(first).patch(f"/api/offers/{offers[first]}/cancel").status_code == 200
+    assert_reconciled()
+
+    with app.app_context():  # what the expiration checker does at the deadline
+        db.session.get(Offer, offers[second]).status = "pendendo_confirmacao"
+        db.session.get(Item, item_id).status = "pendendo_confirmacao"
+        db.session.commit()
+    assert login(owner_id).patch(f"/api/offers/{offers[second]}/confirm").status_code == 200
+    assert login(second).patch(f"/api/offers/{offers[second]}/confirm").status_code == 200
+    assert_reconciled()
+
+    with app.app_context():
+        assert _aggregates(item_id) == (0, None)
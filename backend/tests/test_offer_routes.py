@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import db, User, Item, ItemImage, Offer
+
+
+@pytest.fixture()
+def bidder_with_offers(app):
+    """A bidder with one live offer on each of 7 items (2 images each) of another user."""
+    with app.app_context():
+        owner = User(username="owner", email="owner@x.com", password_hash="x")
+        bidder = User(username="bidder", email="bidder@x.com", password_hash="x")
+        db.session.add_all([owner, bidder])
+        db.session.flush()
+
+        now = datetime.utcnow()
+        for n in range(7):
+            item = Item(
+                owner_id=owner.id, owner_username=owner.username, title=f"Item {n}",
+                category="Móveis", offer_type="pay", state="Acre", city="Xapuri",
+                duration_days=7, created_at=now - timedelta(hours=n),
+            )
+            item.images = [ItemImage(image_url=f"/items/image/{n}-{pos}.jpg", position=pos) for pos in range(2)]
+            db.session.add(item)
+            db.session.flush()
+            db.session.add(Offer(
+                user_id=bidder.id, user_name=bidder.username, item_id=item.id, price=10.0 + n,
+                status="pendendo_confirmacao" if n % 3 == 0 else "ativo",
+                created_at=now - timedelta(minutes=n),
+            ))
+        db.session.commit()
+        return bidder.id
+
+
+def _get_counted(client, count_statements, url):
+    with count_statements() as counter:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), counter.count
+
+
+@pytest.mark.parametrize("status", [None, "ativo", "pendendo_confirmacao", "ativo,pendendo_confirmacao"])
+def test_my_offers_costs_two_statements_per_page(login, count_statements, bidder_with_offers, status):
+    client = login(bidder_with_offers)
+    query = f"&status={status}" if status else ""
+
+    body, statements = _get_counted(client, count_statements, f"/api/offers/my?limit=2{query}")
+    pages, seen = 1, [entry["offer"]["id"] for entry in body["data"]]
+    assert statements == 2
+    assert all(len(entry["item"]["images"]) == 2 for entry in body["data"])
+
+    while body["next_cursor"]:
+        body, statements = _get_counted(
+            client, count_statements, f"/api/offers/my?limit=2{query}&cursor={body['next_cursor']}"
+        )
+        assert statements == 2
+        pages += 1
+        seen += [entry["offer"]["id"] for entry in body["data"]]
+
+    expected = {None: 7, "ativo": 4, "pendendo_confirmacao": 3, "ativo,pendendo_confirmacao": 7}[status]
+    assert len(seen) == len(set(seen)) == expected
+    assert pages == (expected + 1) // 2
+
+
+@pytest.fixture()
+def item_and_bidder(app):
+    """(item id, bidder id): an active item of another user."""
+    with app.app_context():
+        owner = User(username="owner", email="owner@x.com", password_hash="x")
+        bidder = User(username="bidder", email="bidder@x.com", password_hash="x")
+        db.session.add_all([owner, bidder])
+        db.session.flush()
+        item = Item(
+            owner_id=owner.id, owner_username=owner.username, title="Sofá", category="Móveis",
+            offer_type="pay", state="Acre", city="Xapuri", duration_days=7,
+        )
+        db.session.add(item)
+        db.session.commit()
+        return item.id, bidder.id
+
+
+def test_second_live_offer_is_rejected(app, login, item_and_bidder):
+    item_id, bidder_id = item_and_bidder
+    client = login(bidder_id)
+
+    first = client.post("/api/offers/", json={"item_id": item_id, "price": 10})
+    second = client.post("/api/offers/", json={"item_id": item_id, "price": 12})
+
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.get_json() == {"error": "You have already made an offer on this item"}
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count(Offer.id))) == 1
+        item = db.session.get(Item, item_id)
+        assert (item.offer_count, item.best_price) == (1, 10.0)
+
+
+def test_other_integrity_errors_are_not_reported_as_duplicates(app, login, item_and_bidder, monkeypatch):
+    import sqlite3
+    from sqlalchemy.exc import IntegrityError
+
+    item_id, bidder_id = item_and_bidder
+    client = login(bidder_id)
+
+    def commit_fails():
+        raise IntegrityError("INSERT INTO offers ...", {}, sqlite3.IntegrityError("FOREIGN KEY constraint failed"))
+    monkeypatch.setattr(db.session, "commit", commit_fails)
+
+    with pytest.raises(IntegrityError):
+        client.post("/api/offers/", json={"item_id": item_id, "price": 10})
@@ -0,0 +1,54 @@
+from models import db, User, Item
+from utils.categories import category_counts
+from utils.facets import facet_cache
+from utils.home_feed import home_feed
+
+
+def _new_item(owner):
+    return Item(
+        owner_id=owner.id, owner_username=owner.username, title="Sofá", category="Móveis",
+        category_id=6, offer_type="free", state="Acre", city="Xapuri", duration_days=7,
+    )
+
+
+def _prime_caches(client):
+    """Loads every cache; returns the active count of category 6 before the write."""
+    facet_cache.put(("any",), {"total": 0}, facet_cache.generation())
+    assert client.get("/api/items/").status_code == 200  # builds the home feed
+    return category_counts.snapshot().get(6, 0)
+
+
+def test_committed_item_writes_reach_every_cache(app, client):
+    with app.app_context():
+        owner = User(username="owner", email="owner@x.com", password_hash="x")
+        db.session.add(owner)
+        db.session.commit()
+        before = _prime_caches(client)
+
+        item = _new_item(owner)
+        db.session.add(item)
+        db.session.flush()
+        assert category_counts.snapshot().get(6, 0) == before  # not before the commit
+        assert facet_cache.get(("any",)) is not None
+        db.session.commit()
+
+        assert category_counts.snapshot()[6] == before + 1
+        assert facet_cache.get(("any",)) is None
+        assert home_feed._dirty == {item.id}
+
+
+def test_rolled_back_item_writes_are_dropped(app, client):
+    with app.app_context():
+        owner = User(username="owner", email="owner@x.com", password_hash="x")
+        db.session.add(owner)
+        db.session.commit()
+        before = _prime_caches(client)
+
+        db.session.add(_new_item(owner))
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+
+        assert category_counts.snapshot().get(6, 0) == before
+        assert facet_cache.get(("any",)) is not None
+        assert not home_feed._dirty
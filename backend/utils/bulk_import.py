@@ -0,0 +1,266 @@
+import csv
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from data.categories import CATEGORY_IDS
+from models import db, Item, ItemImage
+from utils.categories import items_inserted
+from utils.facets import facet_cache
+from utils.home_feed import home_feed
+from utils.image_processing import save_image_bytes, remove_uploaded_images
+from utils.location import invalid_locations
+from utils.metrics import ITEMS_CREATED, IMAGES_UPLOADED
+
+VALID_DURATIONS = {1, 7, 15, 30}
+ALLOWED_IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+
+# text columns: anything but a string (or null) is a row error, never a crash
+TEXT_FIELDS = ("title", "description", "category", "offer_type", "state", "city", "address")
+
+# column -> max length (mirrors the Item model)
+MAX_LENGTHS = {"title": 100, "category": 50, "offer_type": 20, "state": 50, "city": 100, "address": 300}
+
+
+class BulkImportError(ValueError):
+    """The request as a whole is unusable (bad manifest/archive); routes answer 400."""
+
+
+# ------------------------------
+# Parsing
+# ------------------------------
+
+def parse_manifest(file_storage, fmt: str = None) -> list:
+    """
+    Reads the manifest into a list of dicts. Format comes from `fmt`
+    ("ndjson" / "csv") or the file extension.
+
+    NDJSON: one JSON object per line, `images` is a list of archive names.
+    CSV: header row, `images` is a ";"-separated list of archive names.
+    """
+    name = (file_storage.filename or "").lower()
+    fmt = (fmt or ("csv" if name.endswith(".csv") else "ndjson")).lower()
+
+    try:
+        text = file_storage.read().decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise BulkImportError("manifest must be UTF-8") from exc
+
+    if fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+        for row in rows:
+            raw = row.get("images") or ""
+            row["images"] = [x.strip() for x in raw.split(";") if x.strip()]
+        return rows
+
+    if fmt == "ndjson":
+        rows = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise BulkImportError(f"invalid JSON on manifest line {line_no}") from exc
+            if not isinstance(row, dict):
+                raise BulkImportError(f"manifest line {line_no} is not an object")
+            rows.append(row)
+        return rows
+
+    raise BulkImportError("format must be 'ndjson' or 'csv'")
+
+
+def open_archive(file_storage, max_image_bytes: int):
+    """
+    Opens the optional .zip of images. Returns {name: ZipInfo} of usable
+    entries (allowed extension, not a directory, under the size cap).
+    """
+    if not file_storage:
+        return None, {}
+    try:
+        archive = zipfile.ZipFile(file_storage.stream)
+    except zipfile.BadZipFile as exc:
+        raise BulkImportError("images must be a .zip archive") from exc
+
+    entries = {}
+    for info in archive.infolist():
+        if info.is_dir() or info.file_size > max_image_bytes:
+            continue
+        ext = info.filename.rsplit(".", 1)[-1].lower() if "." in info.filename else ""
+        if ext in ALLOWED_IMAGE_EXTENSIONS:
+            entries[info.filename] = info
+    return archive, entries
+
+
+# ------------------------------
+# Validation (one pass over all rows)
+# ------------------------------
+
+def _text(row, field) -> str:
+    """The field as a string, "" when missing or not a string (reported separately)."""
+    value = row.get(field)
+    return value if isinstance(value, str) else ""
+
+
+def validate_rows(rows, archive_entries) -> tuple:
+    """
+    Returns (valid, errors):
+      valid  -> list of (row_index, item_values, image_names)
+      errors -> {row_index: [messages]}
+
+    Locations are checked as a batch of distinct (state, city) pairs and
+    categories against a dict, so cost does not grow with repeated values.
+    """
+    bad_locations = invalid_locations(
+        (_text(r, "state").strip(), _text(r, "city").strip()) for r in rows
+    )
+
+    valid, errors = [], {}
+    for idx, row in enumerate(rows):
+        wrong_type = [field for field in TEXT_FIELDS if not isinstance(row.get(field), (str, type(None)))]
+        problems = [f"Invalid {field}" for field in wrong_type]
+
+        values = {
+            "title": _text(row, "title").strip(),
+            "description": _text(row, "description") or None,
+            "category": _text(row, "category").strip(),
+            "offer_type": (_text(row, "offer_type") or "free").strip(),
+            "state": _text(row, "state").strip(),
+            "city": _text(row, "city").strip(),
+            "address": _text(row, "address") or None,
+        }
+
+        if not values["title"] or not values["category"]:
+            if not {"title", "category"} & set(wrong_type):
+                problems.append("Missing required fields")
+        elif values["category"] not in CATEGORY_IDS:
+            problems.append(f"Invalid category: {values['category']}")
+        else:
+            values["category_id"] = CATEGORY_IDS[values["category"]]
+
+        try:
+            values["duration_days"] = int(row.get("duration_days"))
+        except (TypeError, ValueError):
+            values["duration_days"] = None
+        if values["duration_days"] not in VALID_DURATIONS:
+            problems.append("Invalid duration")
+
+        try:
+            volume = row.get("volume")
+            values["volume"] = float(volume) if volume not in (None, "") else None
+        except (TypeError, ValueError):
+            problems.append("Invalid volume")
+
+        if not values["state"] or not values["city"]:
+            if not {"state", "city"} & set(wrong_type):
+                problems.append("State and city are required")
+        elif (values["state"], values["city"]) in bad_locations:
+            problems.append(f"Invalid city '{values['city']}' for state '{values['state']}'")
+
+        for column, limit in MAX_LENGTHS.items():
+            if values.get(column) and len(values[column]) > limit:
+                problems.append(f"{column} longer than {limit} characters")
+
+        image_names = row.get("images") or []
+        if not isinstance(image_names, list):
+            image_names = [image_names]
+        if not all(isinstance(name, str) for name in image_names):
+            problems.append("Invalid images")
+        else:
+            missing = [name for name in image_names if name not in archive_entries]
+            if missing:
+                problems.append(f"Images not found in archive: {', '.join(missing)}")
+
+        if problems:
+            errors[idx] = problems
+        else:
+            valid.append((idx, values, image_names))
+
+    return valid, errors
+
+
+# ------------------------------
+# Insertion (set-based, batched)
+# ------------------------------
+
+def import_items(valid, archive, archive_entries, owner, upload_folder: str, batch_size: int, results: dict):
+    """
+    Generator: inserts `valid` rows batch by batch, yielding a progress event
+    after each one and filling `results` with {row_index: row_result}.
+
+    Each batch is one transaction: a multi-row INSERT ... RETURNING id for
+    the items and one multi-row INSERT for their images. A failing batch is
+    rolled back, its files removed, and its rows reported as errors.
+    """
+    done = 0
+
+    for start in range(0, len(valid), batch_size):
+        batch = valid[start:start + batch_size]
+        saved_files = []
+        try:
+            item_rows, image_urls = [], []
+            now = datetime.utcnow()
+            for _, values, image_names in batch:
+                urls = []
+                for name in image_names:
+                    filename = save_image_bytes(
+                        archive.read(archive_entries[name]), os.path.basename(name), upload_folder
+                    )
+                    saved_files.append(filename)
+                    urls.append(f"/items/image/{filename}")
+                image_urls.append(urls)
+                item_rows.append({
+                    **values,
+                    "owner_id": owner.id,
+                    "owner_username": owner.username,
+                    "image_url": urls[0] if urls else None,
+                    "status": "ativo",
+                    "created_at": now,
+                })
+
+            item_ids = db.session.scalars(
+                insert(Item).returning(Item.id, sort_by_parameter_order=True), item_rows
+            ).all()
+
+            image_rows = [
+                {"item_id": item_id, "image_url": url, "position": pos, "enabled": True}
+                for item_id, urls in zip(item_ids, image_urls)
+                for pos, url in enumerate(urls)
+            ]
+            if image_rows:
+                db.session.execute(insert(ItemImage), image_rows)
+
+            db.session.commit()
+            items_inserted(row["category_id"] for row in item_rows)
+            facet_cache.clear()  # Core INSERT: no mapper events
+            home_feed.items_changed(item_ids, total_delta=len(item_ids))
+            ITEMS_CREATED.labels("bulk").inc(len(item_ids))
+            IMAGES_UPLOADED.labels("bulk").inc(len(saved_files))
+            for (idx, _, _), item_id in zip(batch, item_ids):
+                results[idx] = {"row": idx, "status": "created", "item_id": item_id}
+        except Exception as exc:
+            db.session.rollback()
+            remove_uploaded_images(saved_files, upload_folder)
+            for idx, _, _ in batch:
+                results[idx] = {"row": idx, "status": "error", "errors": [f"database error: {type(exc).__name__}"]}
+
+        done += len(batch)
+        yield {"event": "progress", "processed": done, "total": len(valid)}
+
+
+def build_report(total: int, errors: dict, results: dict) -> dict:
+    rows = dict(results)
+    for idx, problems in errors.items():
+        rows[idx] = {"row": idx, "status": "error", "errors": problems}
+    ordered = [rows[idx] for idx in sorted(rows)]
+    created = sum(1 for r in ordered if r["status"] == "created")
+    return {
+        "total": total,
+        "created": created,
+        "failed": total - created,
+        "results": ordered,
+    }
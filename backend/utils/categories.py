@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import func, insert, inspect, select, update
+
+from data.categories import CATEGORY_IDS
+from models import db, Category, Item
+from utils.session_changes import committed_and_current, track_committed_changes
+
+logger = logging.getLogger("itemhub.categories")
+
+ACTIVE_STATUS = "ativo"
+_DELTAS_KEY = "category_count_deltas"
+
+
+# -----------------------------------------
+# Reference table
+# -----------------------------------------
+
+def sync_categories():
+    """
+    Inserts the categories of data/categories.py missing from the table and
+    fills items.category_id from the category name where it is still NULL.
+    Returns (categories inserted, items backfilled, items left without id).
+    """
+    existing = set(db.session.scalars(select(Category.id)))
+    missing = [{"id": cid, "name": name} for name, cid in CATEGORY_IDS.items() if cid not in existing]
+    if missing:
+        db.session.execute(insert(Category), missing)
+
+    backfilled = db.session.execute(
+        update(Item)
+        .where(Item.category_id.is_(None))
+        .values(category_id=select(Category.id).where(Category.name == Item.category).scalar_subquery())
+    ).rowcount
+    unknown = db.session.scalar(select(func.count(Item.id)).where(Item.category_id.is_(None)))
+    db.session.commit()
+    return len(missing), backfilled - unknown, unknown
+
+
+# -----------------------------------------
+# Active-item counts (per process)
+# -----------------------------------------
+
+class CategoryCounts:
+    """
+    Number of items with status "ativo" per category id, kept in memory.
+
+    Loaded with one GROUP BY on the primary, then moved by the item writes
+    this process commits (see the session events below), so reads never hit
+    the database. Writes committed by other processes are picked up by a full
+    reload every `refresh_seconds`, triggered by the first read after it
+    is due. Items past their deadline count until the expiration checker
+    moves them out of "ativo".
+    """
+
+    def __init__(self, refresh_seconds: float = 60):
+        self.refresh_seconds = refresh_seconds
+        self._counts = None
+        self._loaded_at = 0.0
+        self._reloading = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> Counter:
+        # primary engine, not the session: a lagging replica would undo recent deltas
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                select(Item.category_id, func.count())
+                .where(Item.status == ACTIVE_STATUS, Item.category_id.is_not(None))
+                .group_by(Item.category_id)
+            ).all()
+        return Counter(dict(rows))
+
+    def snapshot(self) -> dict:
+        """{category_id: active items}; reloads first when the copy is stale."""
+        with self._lock:
+            counts = self._counts
+            due = time.monotonic() - self._loaded_at >= self.refresh_seconds
+            reload = counts is None or (due and not self._reloading)
+            if reload:
+                self._reloading = True
+        if not reload:
+            return dict(counts)
+
+        try:
+            fresh = self._load()
+        except Exception:
+            with self._lock:
+                self._reloading = False
+            if counts is None:
+                raise
+            logger.warning("could not reload category counts, serving the previous ones", exc_info=True)
+            return dict(counts)
+
+        with self._lock:
+            self._counts = fresh
+            self._loaded_at = time.monotonic()
+            self._reloading = False
+        return dict(fresh)
+
+    def apply(self, deltas: Counter):
+        """Adds committed changes; ignored until the first load."""
+        with self._lock:
+            if self._counts is None:
+                return
+            for category_id, delta in deltas.items():
+                count = self._counts[category_id] + delta
+                if count > 0:
+                    self._counts[category_id] = count
+                else:
+                    self._counts.pop(category_id, None)
+
+
+category_counts = CategoryCounts()
+
+
+# -----------------------------------------
+# Session events: ORM item writes -> deltas
+# -----------------------------------------
+
+def _active_key(status, category_id):
+    return category_id if status == ACTIVE_STATUS else None
+
+
+def _collect_deltas(session, pending):
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Item):
+            deltas[_active_key(obj.status, obj.category_id)] += 1
+    for obj in session.dirty:
+        if isinstance(obj, Item):
+            attrs = inspect(obj).attrs
+            old_status, new_status = committed_and_current(attrs.status)
+            old_category, new_category = committed_and_current(attrs.category_id)
+            deltas[_active_key(old_status, old_category)] -= 1
+            deltas[_active_key(new_status, new_category)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            deltas[_active_key(obj.status, obj.category_id)] -= 1
+
+    deltas = {key: delta for key, delta in deltas.items() if key is not None and delta}
+    if deltas:
+        pending = pending or Counter()
+        pending.update(deltas)
+    return pending
+
+
+def items_inserted(category_ids):
+    """For Core INSERTs (bulk import), which bypass the session events; call after commit."""
+    category_counts.apply(Counter(cid for cid in category_ids if cid is not None))
+
+
+def init_category_counts(app):
+    """
+    Sets the reload period (CATEGORY_COUNTS_REFRESH_SECONDS) and hooks the
+    ORM session events that keep `category_counts` current between reloads.
+    """
+    category_counts.refresh_seconds = app.config["CATEGORY_COUNTS_REFRESH_SECONDS"]
+    track_committed_changes(_DELTAS_KEY, category_counts.apply, _collect_deltas)
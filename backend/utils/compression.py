@@ -0,0 +1,148 @@
+import gzip
+import json
+import threading
+from collections import OrderedDict
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+def supported_encodings():
+    """Encodings we can produce, in server preference order."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding():
+    """
+    Picks the best encoding for the current request based on `Accept-Encoding`.
+    Returns None when the client accepts none of ours (or sent q=0 for them).
+    """
+    return request.accept_encodings.best_match(supported_encodings())
+
+
+def compress_bytes(data: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _level_for(encoding: str, config) -> int:
+    if encoding == "br":
+        return config["COMPRESS_BR_LEVEL"]
+    return config["COMPRESS_LEVEL"]
+
+
+def compress_response(response):
+    """
+    after_request hook: compresses eligible responses in place.
+
+    Skips streamed/passthrough bodies, responses already carrying a
+    Content-Encoding (e.g. the precompressed location payloads) and
+    bodies smaller than COMPRESS_MIN_SIZE.
+    """
+    config = current_app.config
+
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if getattr(response, "precompressed", False):
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+    if response.mimetype not in config["COMPRESS_MIMETYPES"]:
+        return response
+    if (response.content_length or 0) < config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    encoding = negotiate_encoding()
+    if not encoding:
+        return response
+
+    body = response.get_data()
+    response.set_data(compress_bytes(body, encoding, _level_for(encoding, config)))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_compression(app):
+    """Registers the compression hook when COMPRESS_ENABLED is set."""
+    if app.config.get("COMPRESS_ENABLED"):
+        app.after_request(compress_response)
+
+
+# -----------------------------------------
+# Precompressed payloads for static data
+# -----------------------------------------
+
+class PrecompressedCache:
+    """
+    Small LRU of JSON payloads serialized once and stored in every
+    encoding we support, so static data (locations) is never re-dumped
+    nor re-compressed per request.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, payload):
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        variants = {None: raw}
+        for encoding in supported_encodings():
+            # built once per key, so use the strongest levels
+            level = 11 if encoding == "br" else 9
+            variants[encoding] = compress_bytes(raw, encoding, level)
+        return variants
+
+    def get(self, key, build_payload):
+        with self._lock:
+            variants = self._entries.get(key)
+            if variants is not None:
+                self._entries.move_to_end(key)
+                return variants
+
+        variants = self._build(build_payload())
+
+        with self._lock:
+            self._entries[key] = variants
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return variants
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+precompressed_cache = PrecompressedCache()
+
+
+def precompressed_json_response(key, build_payload, status: int = 200):
+    """
+    Returns a JSON response for a cacheable payload, served from
+    `precompressed_cache`. `build_payload` is only called on a cache miss.
+    """
+    variants = precompressed_cache.get(key, build_payload)
+
+    encoding = None
+    if current_app.config.get("COMPRESS_ENABLED"):
+        encoding = negotiate_encoding()
+        if len(variants[None]) < current_app.config["COMPRESS_MIN_SIZE"]:
+            encoding = None
+
+    response = current_app.response_class(
+        variants[encoding], status=status, mimetype="application/json"
+    )
+    response.precompressed = True
+    if current_app.config.get("COMPRESS_ENABLED"):
+        response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
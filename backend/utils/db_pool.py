@@ -0,0 +1,114 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+from utils.metrics import DB_POOL_TIMEOUTS, DB_POOL_WAIT
+
+
+class PoolMetrics:
+    """Checkout counters shared by every InstrumentedQueuePool of the process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_wait_seconds_total": round(self.wait_seconds_total, 6),
+                "checkout_wait_seconds_max": round(self.wait_seconds_max, 6),
+                "checkout_wait_seconds_avg": round(
+                    self.wait_seconds_total / self.checkouts, 6
+                ) if self.checkouts else 0.0,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record(time.perf_counter() - started, timed_out=True)
+            DB_POOL_TIMEOUTS.inc()
+            raise
+        waited = time.perf_counter() - started
+        pool_metrics.record(waited)
+        DB_POOL_WAIT.observe(waited)
+        return conn
+
+
+def build_engine_options(config, uri: str = None) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS for the configured database.
+
+    SQLite keeps SQLAlchemy's defaults (its pools take no sizing). For
+    server databases the pool is sized per process: the total connections
+    opened against Postgres is workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW),
+    see `flask db-pool-report`. `uri` defaults to the primary database
+    (pass the replica URL to size its pool the same way).
+    """
+    uri = uri or config.get("SQLALCHEMY_DATABASE_URI")
+    if not uri or uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+    if config.get("DB_PGBOUNCER"):
+        # Transaction pooling hands each transaction to any server
+        # connection, so named prepared statements cannot be reused.
+        # psycopg2 never prepares server-side; psycopg 3 and asyncpg do.
+        driver = make_url(uri).get_driver_name()
+        if driver == "psycopg":
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+
+    return options
+
+
+def pool_stats(engine) -> dict:
+    """Current pool occupancy plus this process' checkout/wait counters."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+    stats.update(pool_metrics.snapshot())
+    return stats
@@ -0,0 +1,59 @@
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+STICKY_COOKIE = "db_primary_until"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class RoutingSession(Session):
+    """
+    Sends the reads of read-only requests to the replica engine (when one is
+    configured) and everything else (writes, flushes, CLI, scheduler) to
+    the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and _use_replica():
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _use_replica() -> bool:
+    return has_request_context() and g.get("db_use_replica", False)
+
+
+def reads_own_writes() -> bool:
+    """True while this client is pinned to the primary after a write of its own."""
+    return (request.cookies.get(STICKY_COOKIE, type=float) or 0) >= time.time()
+
+
+def _mark_request():
+    """before_request: decide primary vs replica for this request."""
+    g.db_use_replica = request.method in SAFE_METHODS and not reads_own_writes()
+
+
+def _stick_after_write(response):
+    """
+    after_request: after a successful write, pin this client to the primary
+    for REPLICA_STICKY_SECONDS so it reads its own writes despite replica lag.
+    """
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        window = current_app.config["REPLICA_STICKY_SECONDS"]
+        response.set_cookie(
+            STICKY_COOKIE, str(time.time() + window),
+            max_age=int(window) + 1, httponly=True, samesite="Lax",
+        )
+    return response
+
+
+def init_db_routing(app):
+    """Enables replica routing when SQLALCHEMY_BINDS has a "replica" bind."""
+    if REPLICA_BIND not in app.config.get("SQLALCHEMY_BINDS", {}):
+        return
+    app.before_request(_mark_request)
+    app.after_request(_stick_after_write)
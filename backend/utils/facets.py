@@ -0,0 +1,209 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import String, event, func, inspect, literal, select, tuple_, union_all
+from sqlalchemy.orm import object_session
+
+from data.categories import ITEM_CATEGORIES
+from models import db, Item
+from utils.session_changes import track_committed_changes
+
+# GROUPING(category_id, state, city, offer_type): bit set = column rolled up
+_GROUPINGS = {
+    0b0111: "categories",
+    0b1011: "states",
+    0b1001: "cities",
+    0b1110: "offer_types",
+    0b1111: "total",
+}
+# Item columns the listing filters read; offer_count only matters to min_offers
+_FILTERED_ATTRS = (
+    "status", "created_at", "duration_days", "owner_id", "category_id",
+    "state", "city", "offer_type", "title", "description",
+)
+
+
+# -----------------------------------------
+# Single grouped pass
+# -----------------------------------------
+
+def _grouping_sets_rows(where):
+    """Postgres: one scan, GROUPING SETS ((category_id), (state), (state, city), (offer_type), ())."""
+    columns = (Item.category_id, Item.state, Item.city, Item.offer_type)
+    stmt = (
+        select(func.grouping(*columns), *columns, func.count())
+        .where(where)
+        .group_by(func.grouping_sets(
+            tuple_(Item.category_id), tuple_(Item.state), tuple_(Item.state, Item.city),
+            tuple_(Item.offer_type), tuple_(),
+        ))
+    )
+    return db.session.execute(stmt).all()
+
+
+def _union_rows(where):
+    """Fallback without GROUPING SETS (SQLite): the same rows from one UNION ALL statement."""
+    none = literal(None, String)
+    parts = [
+        select(literal(0b0111), Item.category_id, none, none, none, func.count())
+        .where(where).group_by(Item.category_id),
+        select(literal(0b1011), none, Item.state, none, none, func.count())
+        .where(where).group_by(Item.state),
+        select(literal(0b1001), none, Item.state, Item.city, none, func.count())
+        .where(where).group_by(Item.state, Item.city),
+        select(literal(0b1110), none, none, none, Item.offer_type, func.count())
+        .where(where).group_by(Item.offer_type),
+        select(literal(0b1111), none, none, none, none, func.count()).where(where),
+    ]
+    return db.session.execute(union_all(*parts)).all()
+
+
+def compute_facets(query) -> dict:
+    """
+    Counts of the items matched by `query` (an Item query with the listing
+    filters applied) per category, state, (state, city) and offer type, plus
+    the total, in one statement. Every facet sees all the current filters.
+    """
+    where = query.whereclause if query.whereclause is not None else literal(True)
+    if db.engine.dialect.name == "postgresql":
+        rows = _grouping_sets_rows(where)
+    else:
+        rows = _union_rows(where)
+
+    facets = {"total": 0, "categories": [], "states": [], "cities": [], "offer_types": []}
+    for grouping, category_id, state, city, offer_type, count in rows:
+        name = _GROUPINGS.get(grouping)
+        if name == "total":
+            facets["total"] = count
+        elif name == "categories" and category_id:
+            facets[name].append({"id": category_id, "name": ITEM_CATEGORIES[category_id - 1], "count": count})
+        elif name == "states" and state:
+            facets[name].append({"value": state, "count": count})
+        elif name == "cities" and city:
+            facets[name].append({"state": state, "city": city, "count": count})
+        elif name == "offer_types" and offer_type:
+            facets[name].append({"value": offer_type, "count": count})
+
+    for name in ("categories", "states", "cities", "offer_types"):
+        facets[name].sort(key=lambda entry: (
+            -entry["count"], entry.get("name") or entry.get("value") or entry["city"],
+        ))
+    return facets
+
+
+# -----------------------------------------
+# Cache
+# -----------------------------------------
+
+def cache_key(filters: dict) -> tuple:
+    return tuple(
+        (name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(filters.items())
+    )
+
+
+class FacetCache:
+    """
+    Process-local TTL + LRU cache of facet results, keyed by the normalized
+    filters. Item writes committed in this process clear it (see the events
+    below); other worker processes converge within the TTL, which also
+    bounds how long items that passed their deadline keep being counted.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, facets = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return facets
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, key, facets, generation: int):
+        """Stores unless the items changed since `generation` was read (result may predate the write)."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, facets)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, only_min_offers: bool = False):
+        with self._lock:
+            self._generation += 1
+            if only_min_offers:
+                for key in [k for k in self._entries if dict(k)["min_offers"]]:
+                    del self._entries[key]
+            else:
+                self._entries.clear()
+
+
+facet_cache = FacetCache()
+
+
+def cached_facets(filters: dict, query) -> dict:
+    key = cache_key(filters)
+    facets = facet_cache.get(key)
+    if facets is None:
+        generation = facet_cache.generation()
+        facets = compute_facets(query)
+        facet_cache.put(key, facets, generation)
+    return facets
+
+
+def init_facet_cache(app):
+    """Applies FACETS_CACHE_TTL / FACETS_CACHE_SIZE from the app config."""
+    facet_cache.ttl_seconds = app.config["FACETS_CACHE_TTL"]
+    facet_cache.max_entries = app.config["FACETS_CACHE_SIZE"]
+    facet_cache.clear()
+
+
+# Explicit invalidation: item writes mark the session (history is complete
+# before the flush) and the cache is cleared once they are committed, so a
+# concurrent request cannot store counts read before the commit.
+# Core INSERTs (bulk import) bypass these and call facet_cache.clear() themselves.
+_PENDING_KEY = "facet_cache_clear"
+_CLEAR_MIN_OFFERS, _CLEAR_ALL = 1, 2
+
+
+def _mark(target, level):
+    session = object_session(target)
+    if session is not None:
+        session.info[_PENDING_KEY] = max(session.info.get(_PENDING_KEY, 0), level)
+
+
+@event.listens_for(Item, "before_insert")
+@event.listens_for(Item, "before_delete")
+def _item_added_or_removed(mapper, connection, target):
+    _mark(target, _CLEAR_ALL)
+
+
+@event.listens_for(Item, "before_update")
+def _item_updated(mapper, connection, target):
+    attrs = inspect(target).attrs
+    if any(attrs[name].history.has_changes() for name in _FILTERED_ATTRS):
+        _mark(target, _CLEAR_ALL)
+    elif attrs.offer_count.history.has_changes():
+        _mark(target, _CLEAR_MIN_OFFERS)
+
+
+def _clear_committed(level):
+    facet_cache.clear(only_min_offers=level == _CLEAR_MIN_OFFERS)
+
+
+track_committed_changes(_PENDING_KEY, _clear_committed)
@@ -0,0 +1,238 @@
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, inspect, select
+from sqlalchemy.orm import Session, selectinload
+
+from models import db, Item, ItemImage
+from utils.metrics import HOME_FEED_REBUILDS
+from utils.session_changes import committed_and_current, track_committed_changes
+
+logger = logging.getLogger("itemhub.home_feed")
+
+ACTIVE_STATUS = "ativo"
+_CHANGES_KEY = "home_feed_changes"
+
+
+class HomeFeed:
+    """
+    Materialized default listing (GET /api/items/ without filters: status
+    "ativo", valid, newest first): the newest `size` valid items as
+    pre-serialized `to_dict()` JSON, plus the total, so those pages cost a
+    slice instead of a count and a scan.
+
+    Rebuilt (one count, one query for `size` items) every `refresh_seconds`
+    by the first request after it is due, while concurrent requests keep
+    serving the previous copy. In between, items changed by commits of this
+    process are re-read by id and re-serialized on the next request. Both
+    read the primary, never the replica, which may not have the commits yet. Items
+    whose deadline passes leave the served pages right away; the total
+    catches up at the next rebuild.
+    """
+
+    def __init__(self, size: int = 500, refresh_seconds: float = 10):
+        self.size = size
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Forgets the materialized copy; the next page rebuilds it."""
+        with self._lock:
+            self._keys = []          # (created_at, id), oldest first
+            self._cards = []         # (expires_at, json), same order as _keys
+            self._key_by_id = {}
+            self._total = 0
+            self._complete = False   # every valid item is in the feed
+            self._built_at = None
+            self._building = False
+            self._dirty = set()
+
+    # ------------------------------
+    # Reads
+    # ------------------------------
+
+    def page(self, offset: int, limit: int):
+        """(card JSON strings newest first, total) or None when the feed cannot answer."""
+        self._refresh()
+        with self._lock:
+            if self._built_at is None:
+                return None
+            if offset + limit > len(self._keys) and not self._complete:
+                return None  # deeper than the materialized window
+            cards = self._slice(offset, limit)
+            now = datetime.now()
+            if any(expires_at <= now for expires_at, _ in cards):
+                self._drop_expired(now)
+                if offset + limit > len(self._keys) and not self._complete:
+                    return None
+                cards = self._slice(offset, limit)
+            return [card for _, card in cards], self._total
+
+    def _slice(self, offset, limit):
+        end = len(self._cards) - offset
+        return self._cards[max(0, end - limit):max(0, end)][::-1]
+
+    def _drop_expired(self, now):
+        expired = [key for key, (expires_at, _) in zip(self._keys, self._cards) if expires_at <= now]
+        for _, item_id in expired:
+            self._remove(item_id)
+
+    # ------------------------------
+    # Refresh
+    # ------------------------------
+
+    def _refresh(self):
+        with self._lock:
+            if self._building:
+                return
+            due = self._built_at is None or time.monotonic() - self._built_at >= self.refresh_seconds
+            if not due and not self._dirty:
+                return
+            self._building = True
+            dirty, self._dirty = self._dirty, set()
+        try:
+            # changes are marked after their commit, so a rebuild (on the primary) already sees them
+            if due:
+                self._rebuild()
+            else:
+                self._reload(dirty)
+        except Exception:
+            with self._lock:
+                self._dirty |= dirty
+            logger.warning("could not refresh the home feed", exc_info=True)
+        finally:
+            with self._lock:
+                self._building = False
+
+    def _rebuild(self):
+        started = time.perf_counter()
+        valid = (Item.status == ACTIVE_STATUS, Item.is_valid)
+        # primary engine, not the request's session: a lagging replica would miss recent commits
+        with Session(db.engine) as session:
+            total = session.scalar(select(func.count(Item.id)).where(*valid))
+            items = session.scalars(
+                select(Item)
+                .where(*valid)
+                .options(selectinload(Item.images))
+                .order_by(Item.created_at.desc(), Item.id.desc())
+                .limit(self.size)
+            ).all()
+            entries = sorted(self._entry(item) for item in items)
+        with self._lock:
+            self._keys = [key for key, _ in entries]
+            self._cards = [card for _, card in entries]
+            self._key_by_id = {key[1]: key for key in self._keys}
+            self._total = total
+            self._complete = len(items) < self.size
+            self._built_at = time.monotonic()
+        HOME_FEED_REBUILDS.inc()
+        logger.debug("home feed rebuilt", extra={
+            "items": len(items), "total": total, "ms": round((time.perf_counter() - started) * 1000, 2),
+        })
+
+    def _reload(self, item_ids):
+        with Session(db.engine) as session:
+            entries = [
+                self._entry(item)
+                for item in session.scalars(
+                    select(Item)
+                    .where(Item.id.in_(item_ids), Item.status == ACTIVE_STATUS, Item.is_valid)
+                    .options(selectinload(Item.images))
+                )
+            ]
+        with self._lock:
+            for item_id in item_ids:
+                self._remove(item_id)
+            for entry in entries:
+                self._insert(*entry)
+
+    def _entry(self, item):
+        # compact, like jsonify's response body, so feed and database pages are byte-identical
+        card = current_app.json.dumps(item.to_dict(), separators=(",", ":"))
+        return (item.created_at, item.id), (item.expires_at, card)
+
+    def _remove(self, item_id):
+        key = self._key_by_id.pop(item_id, None)
+        if key is not None:
+            n = bisect.bisect_left(self._keys, key)
+            del self._keys[n], self._cards[n]
+
+    def _insert(self, key, card):
+        if not self._complete and self._keys and key < self._keys[0]:
+            return  # older than the window; the feed never held its neighbours
+        n = bisect.bisect_left(self._keys, key)
+        self._keys.insert(n, key)
+        self._cards.insert(n, card)
+        self._key_by_id[key[1]] = key
+        if len(self._keys) > self.size:
+            del self._key_by_id[self._keys[0][1]]
+            del self._keys[0], self._cards[0]
+            self._complete = False
+
+    # ------------------------------
+    # Writes
+    # ------------------------------
+
+    def items_changed(self, item_ids, total_delta: int = 0):
+        """Committed changes: re-read these items on the next page; adjust the total."""
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._dirty.update(item_ids)
+            self._total = max(0, self._total + total_delta)
+
+
+home_feed = HomeFeed()
+
+
+# -----------------------------------------
+# Session events: ORM item / image writes -> changed ids
+# -----------------------------------------
+
+def _collect_changes(session, pending):
+    ids, delta = set(), 0
+    for obj in session.new:
+        if isinstance(obj, Item):
+            ids.add(obj.id)
+            delta += obj.status == ACTIVE_STATUS
+        elif isinstance(obj, ItemImage):
+            ids.add(obj.item_id)
+    for obj in session.dirty:
+        if isinstance(obj, Item):
+            ids.add(obj.id)
+            before, after = committed_and_current(inspect(obj).attrs.status)
+            delta += (after == ACTIVE_STATUS) - (before == ACTIVE_STATUS)
+        elif isinstance(obj, ItemImage):
+            ids.add(obj.item_id)
+    for obj in session.deleted:
+        if isinstance(obj, Item):
+            ids.add(obj.id)
+            delta -= obj.status == ACTIVE_STATUS
+        elif isinstance(obj, ItemImage):
+            ids.add(obj.item_id)
+
+    if ids:
+        pending = pending or [set(), 0]
+        pending[0] |= ids
+        pending[1] += delta
+    return pending
+
+
+def _apply_changes(pending):
+    home_feed.items_changed(*pending)
+
+
+def init_home_feed(app):
+    """
+    Applies HOME_FEED_SIZE / HOME_FEED_REFRESH_SECONDS and hooks the ORM
+    session events that feed committed item changes to `home_feed`.
+    """
+    home_feed.size = app.config["HOME_FEED_SIZE"]
+    home_feed.refresh_seconds = app.config["HOME_FEED_REFRESH_SECONDS"]
+    home_feed.clear()
+    track_committed_changes(_CHANGES_KEY, _apply_changes, _collect_changes)
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from flask import current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import event
+
+from models import User
+
+
+class CurrentUser(NamedTuple):
+    """What write routes need from the authenticated user (no DB row)."""
+    id: int
+    username: str
+    account_version: int
+
+
+class IdentityCache:
+    """
+    Process-local TTL + LRU cache of users known to exist, keyed by id.
+
+    Entries are dropped explicitly whenever a User row is updated or
+    deleted in this process (see the mapper events below); other worker
+    processes converge within the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CurrentUser]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def put(self, user: CurrentUser):
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+identity_cache = IdentityCache()
+
+
+def init_identity_cache(app):
+    """Applies IDENTITY_CACHE_TTL / IDENTITY_CACHE_SIZE from the app config."""
+    identity_cache.ttl_seconds = app.config["IDENTITY_CACHE_TTL"]
+    identity_cache.max_entries = app.config["IDENTITY_CACHE_SIZE"]
+    identity_cache.clear()
+
+
+def identity_claims(user: User) -> dict:
+    """Extra JWT claims issued at login so routes can skip the user lookup."""
+    return {"username": user.username, "ver": user.account_version}
+
+
+def remember_user(user: User) -> CurrentUser:
+    current = CurrentUser(user.id, user.username, user.account_version)
+    identity_cache.put(current)
+    return current
+
+
+def resolve_current_user() -> Optional[CurrentUser]:
+    """
+    Returns the authenticated user for a @jwt_required route, or None if the
+    account no longer exists (or the token's account version was revoked).
+    Callers keep answering 401 on None, exactly like `User.get_by_id`.
+
+    A cache hit whose version matches the token's "ver" claim costs no
+    query; anything else falls back to the primary-key lookup.
+    """
+    user_id = int(get_jwt_identity())
+    token_version = get_jwt().get("ver")
+
+    if current_app.config.get("IDENTITY_CACHE_ENABLED", True):
+        cached = identity_cache.get(user_id)
+        if cached is not None:
+            if token_version is None or token_version == cached.account_version:
+                return cached
+            if token_version < cached.account_version:
+                return None  # token issued before the version bump
+
+    user: User = User.get_by_id(user_id)
+    if not user:
+        identity_cache.invalidate(user_id)
+        return None
+
+    current = remember_user(user)
+    if token_version is not None and token_version != user.account_version:
+        return None
+    return current
+
+
+# Explicit invalidation: any change to a user row in this process drops it.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    identity_cache.invalidate(target.id)
@@ -1,8 +1,17 @@
 import os
+import uuid
 from werkzeug.utils import secure_filename
 from datetime import datetime
 
 
+def _unique_filename(original_name: str) -> str:
+    # Gera nome único e seguro: timestamp + token aleatório + nome original sanitizado
+    # (o token evita colisão entre uploads simultâneos no mesmo instante)
+    timestamp = datetime.utcnow().timestamp()
+    safe_original_name = secure_filename(original_name)
+    return f"{timestamp}_{uuid.uuid4().hex[:8]}_{safe_original_name}"
+
+
 def save_uploaded_image(file_storage, upload_folder: str) -> str:
     """
     Salva a imagem exatamente como foi enviada pelo usuário.
@@ -16,14 +25,44 @@ def save_uploaded_image(file_storage, upload_folder: str) -> str:
     """
     os.makedirs(upload_folder, exist_ok=True)
 
-    # Gera nome único e seguro: timestamp + nome original sanitizado
-    timestamp = datetime.utcnow().timestamp()
-    safe_original_name = secure_filename(file_storage.filename)
-    filename = f"{timestamp}_{safe_original_name}"
-
+    filename = _unique_filename(file_storage.filename)
     save_path = os.path.join(upload_folder, filename)
+    tmp_path = f"{save_path}.part"
 
     # Salva exatamente como veio (mantém formato, qualidade, metadados etc.)
-    file_storage.save(save_path)
+    # em um arquivo temporário e só então renomeia: quem serve a imagem
+    # nunca enxerga um arquivo pela metade.
+    file_storage.save(tmp_path)
+    os.replace(tmp_path, save_path)
+
+    return filename
+
+
+def save_image_bytes(data: bytes, original_name: str, upload_folder: str) -> str:
+    """
+    Mesmo contrato de `save_uploaded_image`, para imagens que não chegam
+    como upload (ex.: extraídas do arquivo .zip da importação em lote).
+    """
+    os.makedirs(upload_folder, exist_ok=True)
+
+    filename = _unique_filename(original_name)
+    save_path = os.path.join(upload_folder, filename)
+    tmp_path = f"{save_path}.part"
+
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, save_path)
 
-    return filename
\ No newline at end of file
+    return filename
+
+
+def remove_uploaded_images(filenames, upload_folder: str) -> None:
+    """
+    Remove arquivos salvos por `save_uploaded_image` cuja transação falhou,
+    para não deixar imagens órfãs no disco. Ignora arquivos já ausentes.
+    """
+    for filename in filenames:
+        try:
+            os.remove(os.path.join(upload_folder, filename))
+        except FileNotFoundError:
+            pass
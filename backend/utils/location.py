@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from data.br_locations import BR_LOCATIONS
 
 # -----------------------------------------
@@ -18,7 +20,23 @@ def is_valid_city(state: str, city: str) -> bool:
     - state exists in BR_LOCATIONS
     - the city matches one of the known cities for that state
     """
-    if state not in BR_LOCATIONS:
-        return False
+    cities = _cities_by_state().get(state)
+    return cities is not None and city in cities
+
+
+@lru_cache(maxsize=None)
+def _cities_by_state() -> dict:
+    """state -> frozenset of cities, built once (O(1) membership checks)."""
+    return {state: frozenset(cities) for state, cities in BR_LOCATIONS.items()}
 
-    return city in BR_LOCATIONS[state]
+
+def invalid_locations(pairs) -> set:
+    """
+    Batch version of is_valid_state/is_valid_city: returns the subset of
+    (state, city) pairs that are not valid. Each distinct pair is checked once.
+    """
+    cities_by_state = _cities_by_state()
+    return {
+        (state, city) for state, city in set(pairs)
+        if city not in cities_by_state.get(state, ())
+    }
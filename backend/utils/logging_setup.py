@@ -0,0 +1,169 @@
+import atexit
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from utils.metrics import LOG_RECORDS_DROPPED
+
+ROOT_LOGGER = "itemhub"
+
+# attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+_exc_formatter = logging.Formatter()
+
+
+def _extra_fields(record):
+    return {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS and not k.startswith("_")}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message and the `extra=` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable variant for local development, `extra=` fields as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def formatMessage(self, record):
+        line = super().formatMessage(record)
+        extra = _extra_fields(record)
+        if extra:
+            line += " " + " ".join(f"{key}={value}" for key, value in extra.items())
+        return line
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps 1 in N records below WARNING for the configured loggers (and their
+    children), counted per message template, so pass arguments with %-style
+    placeholders or `extra=` rather than f-strings. Kept records get `sampled=N`.
+    """
+
+    MAX_TEMPLATES = 10000
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = {name: int(n) for name, n in rates.items() if int(n) > 1}
+        self._counters = {}
+
+    def _rate_for(self, name):
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if not self.rates or record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate is None:
+            return True
+
+        key = (record.name, record.msg)
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) >= self.MAX_TEMPLATES:
+                self._counters.clear()
+            counter = self._counters.setdefault(key, itertools.count())
+        if next(counter) % rate:
+            return False
+        record.sampled = rate
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread. Only the message and traceback are
+    rendered in the calling thread; when the queue is full the record is
+    dropped (and counted) instead of blocking the request.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            # traceback objects keep frames alive, render them here
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+_handler = None
+_listener = None
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()  # flushes what is still queued
+
+
+def _restart_after_fork():
+    # the listener thread does not survive fork (gunicorn preload)
+    global _listener
+    if _listener is None:
+        return
+    records = queue.Queue(_handler.queue.maxsize)
+    _handler.queue = records
+    _listener = QueueListener(records, *_listener.handlers)
+    _listener.start()
+
+
+def init_logging(app):
+    """
+    Routes the `itemhub.*` loggers through a bounded queue to a background
+    thread that writes to stderr, so request and scheduler threads never
+    wait on the stream. Levels come from LOG_LEVEL / LOG_LEVELS, sampling
+    from LOG_SAMPLING. Handlers are installed once per process.
+    """
+    global _handler, _listener
+    config = app.config
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(config["LOG_LEVEL"].upper())
+    for name, level in config["LOG_LEVELS"].items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(TextFormatter() if config["LOG_FORMAT"] == "text" else JSONFormatter())
+
+    _handler = NonBlockingQueueHandler(queue.Queue(config["LOG_QUEUE_SIZE"]))
+    _handler.addFilter(SamplingFilter(config["LOG_SAMPLING"]))
+    root.addHandler(_handler)
+    root.propagate = False  # gunicorn/root handlers would write the records a second time
+
+    _listener = QueueListener(_handler.queue, output)
+    _listener.start()
+    atexit.register(_stop_listener)
+    os.register_at_fork(after_in_child=_restart_after_fork)
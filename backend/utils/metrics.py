@@ -0,0 +1,179 @@
+import os
+import time
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # prometheus_client is optional, metrics become no-ops
+    prometheus_client = None
+
+
+def multiprocess_dir():
+    """Shared directory gunicorn workers write their values to (None = single process)."""
+    return os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+def _metric(kind, name, documentation, labelnames=(), **kwargs):
+    if prometheus_client is None:
+        return _NoopMetric()
+    cls = {"counter": Counter, "gauge": Gauge, "histogram": Histogram}[kind]
+    return cls(name, documentation, labelnames, **kwargs)
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# -----------------------------------------
+# HTTP
+# -----------------------------------------
+REQUEST_LATENCY = _metric(
+    "histogram", "itemhub_http_request_duration_seconds", "Request latency by endpoint.",
+    ("blueprint", "endpoint", "method", "status"), buckets=LATENCY_BUCKETS,
+)
+
+# -----------------------------------------
+# Business counters
+# -----------------------------------------
+ITEMS_CREATED = _metric("counter", "itemhub_items_created_total", "Items created.", ("source",))
+IMAGES_UPLOADED = _metric("counter", "itemhub_item_images_uploaded_total", "Item image files stored.", ("source",))
+ITEMS_EXPIRED = _metric("counter", "itemhub_items_expired_total", "Items processed by the expiration checker.", ("outcome",))
+OFFERS_CREATED = _metric("counter", "itemhub_offers_created_total", "Offers created.")
+OFFER_ACTIONS = _metric("counter", "itemhub_offer_actions_total", "Offer state changes requested by users.", ("action",))
+LOGINS = _metric("counter", "itemhub_auth_logins_total", "Login attempts.", ("result",))
+REGISTRATIONS = _metric("counter", "itemhub_auth_registrations_total", "Registration attempts.", ("result",))
+
+# -----------------------------------------
+# Scheduler (only one process runs it: keep the most recent value)
+# -----------------------------------------
+EXPIRATION_PASS_DURATION = _metric(
+    "histogram", "itemhub_expiration_pass_duration_seconds", "Duration of one expiration checker pass.",
+    buckets=(0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0),
+)
+SCHEDULER_LAST_RUN = _metric(
+    "gauge", "itemhub_scheduler_last_run_timestamp_seconds", "Unix time the last expiration pass started.",
+    multiprocess_mode="mostrecent",
+)
+SCHEDULER_LAG = _metric(
+    "gauge", "itemhub_scheduler_lag_seconds", "How late the last expiration pass started vs. its schedule.",
+    multiprocess_mode="mostrecent",
+)
+
+# -----------------------------------------
+# DB pool (summed over live worker processes)
+# -----------------------------------------
+DB_POOL_CAPACITY = _metric(
+    "gauge", "itemhub_db_pool_capacity_connections", "DB_POOL_SIZE + DB_MAX_OVERFLOW per live process.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_IN_USE = _metric(
+    "gauge", "itemhub_db_pool_connections_in_use", "Connections currently checked out.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = _metric(
+    "histogram", "itemhub_db_pool_checkout_wait_seconds", "Time waited for a pooled connection.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+DB_POOL_TIMEOUTS = _metric("counter", "itemhub_db_pool_checkout_timeouts_total", "Checkouts that hit DB_POOL_TIMEOUT.")
+SLOW_QUERIES = _metric("counter", "itemhub_db_slow_queries_total", "Statements slower than SLOW_QUERY_MS.", ("endpoint",))
+
+# -----------------------------------------
+# Home feed (utils/home_feed.py)
+# -----------------------------------------
+HOME_FEED_REQUESTS = _metric(
+    "counter", "itemhub_home_feed_requests_total", "Default listing pages by where they were served from.", ("source",)
+)
+HOME_FEED_REBUILDS = _metric("counter", "itemhub_home_feed_rebuilds_total", "Full rebuilds of the home feed.")
+
+# -----------------------------------------
+# Logging
+# -----------------------------------------
+LOG_RECORDS_DROPPED = _metric("counter", "itemhub_log_records_dropped_total", "Log records dropped on a full queue.")
+
+
+# -----------------------------------------
+# Hooks
+# -----------------------------------------
+
+def _start_request_clock():
+    g._metrics_started = time.perf_counter()
+
+
+def _observe_request(response):
+    started = g.pop("_metrics_started", None)
+    if started is not None:
+        endpoint = request.endpoint or "unmatched"  # bounded label values only
+        REQUEST_LATENCY.labels(
+            request.blueprint or "", endpoint, request.method, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+    return response
+
+
+_pool_capacity = 0
+
+
+def _on_first_connect(dbapi_connection, connection_record):
+    # per pool instance, so it is also set in workers forked from a preloaded master
+    if _pool_capacity:
+        DB_POOL_CAPACITY.set(_pool_capacity)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_IN_USE.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_IN_USE.dec()
+
+
+def render_latest():
+    """(body, content_type) for the current registry, merged across processes."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+_pool_events = False
+
+
+def init_metrics(app):
+    """
+    Request latency hooks + DB pool listeners. Register before other
+    after_request hooks so the latency covers them.
+    """
+    global _pool_events, _pool_capacity
+    if prometheus_client is None or not app.config["METRICS_ENABLED"]:
+        return
+
+    app.before_request(_start_request_clock)
+    app.after_request(_observe_request)
+
+    if not _pool_events:
+        event.listen(QueuePool, "first_connect", _on_first_connect)
+        event.listen(QueuePool, "checkout", _on_checkout)
+        event.listen(QueuePool, "checkin", _on_checkin)
+        _pool_events = True
+    if not (app.config.get("SQLALCHEMY_DATABASE_URI") or "sqlite").startswith("sqlite"):
+        _pool_capacity = app.config["DB_POOL_SIZE"] + app.config["DB_MAX_OVERFLOW"]
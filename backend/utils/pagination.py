@@ -0,0 +1,51 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import request
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def parse_limit(default: int = DEFAULT_LIMIT, maximum: int = MAX_LIMIT) -> int:
+    """Reads `?limit=` clamped to [1, maximum]."""
+    limit = request.args.get("limit", default=default, type=int)
+    return min(maximum, max(1, limit))
+
+
+def encode_cursor(*values) -> str:
+    """
+    Builds an opaque keyset cursor from the sort key of the last row
+    returned (e.g. created_at, id). Datetimes are stored as ISO strings.
+    """
+    raw = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps(raw, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple) -> tuple:
+    """
+    Inverse of `encode_cursor`. `types` gives the expected type of each
+    position (datetime, int, float...). Raises ValueError on any malformed
+    or tampered cursor so routes can answer 400.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+
+    if not isinstance(raw, list) or len(raw) != len(types):
+        raise ValueError("invalid cursor")
+
+    values = []
+    for value, expected in zip(raw, types):
+        try:
+            if expected is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(expected(value))
+        except (TypeError, ValueError) as exc:
+            raise ValueError("invalid cursor") from exc
+    return tuple(values)
@@ -0,0 +1,143 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Optional, Tuple
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingOverloaded(Exception):
+    """Raised when the hashing pool is saturated; routes answer 503."""
+
+
+# -----------------------------------------
+# Functions executed inside the worker processes
+# (module-level so they can be pickled)
+# -----------------------------------------
+
+def _hash(password: str, method: str, salt_length: int) -> str:
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _verify(stored_hash: str, password: str, rehash_method: Optional[str],
+            salt_length: int) -> Tuple[bool, Optional[str]]:
+    """Checks the password and, if asked to, returns a fresh hash in the same trip."""
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    if rehash_method is None:
+        return True, None
+    return True, _hash(password, rehash_method, salt_length)
+
+
+class PasswordHasher:
+    """
+    Runs Werkzeug's deliberately slow hashing in a bounded process pool so
+    login/register bursts cannot pin the request workers.
+
+    At most `workers + max_queue` hashes may be in flight per process;
+    beyond that (or past `timeout` seconds) callers get HashingOverloaded
+    immediately instead of queueing. `workers = 0` hashes inline, which
+    is what CLI commands and local debugging want.
+    """
+
+    def __init__(self):
+        self.method = "scrypt"
+        self.salt_length = 16
+        self.workers = 0
+        self.max_queue = 0
+        self.timeout = 5.0
+        self._canonical_method = None
+        self._executor = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def configure(self, method: str, salt_length: int, workers: int,
+                  max_queue: int, timeout: float):
+        self.shutdown()
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._canonical_method = None
+        self._slots = threading.BoundedSemaphore(workers + max_queue) if workers else None
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # created lazily: gunicorn forks after import, each worker gets its own pool
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise HashingOverloaded("password hashing queue is full")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise HashingOverloaded("password hashing timed out")
+
+    # ------------------------------
+    # Public API
+    # ------------------------------
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.method, self.salt_length)
+
+    def verify(self, stored_hash: str, password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (ok, new_hash). `new_hash` is set when the stored hash uses
+        weaker/older parameters than the configured ones and should replace it.
+        """
+        rehash_method = self.method if self.needs_rehash(stored_hash) else None
+        return self._run(_verify, stored_hash, password, rehash_method, self.salt_length)
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        try:
+            method, salt, _ = stored_hash.split("$", 2)
+        except ValueError:
+            return True
+        return method != self.canonical_method() or len(salt) < self.salt_length
+
+    def canonical_method(self) -> str:
+        """
+        The configured method with Werkzeug's defaults filled in
+        (e.g. "scrypt" -> "scrypt:32768:8:1"), as it appears in stored hashes.
+        """
+        if self._canonical_method is None:
+            sample = generate_password_hash("", method=self.method, salt_length=1)
+            self._canonical_method = sample.split("$", 1)[0]
+        return self._canonical_method
+
+
+password_hasher = PasswordHasher()
+
+
+def init_password_hasher(app):
+    password_hasher.configure(
+        method=app.config["PASSWORD_HASH_METHOD"],
+        salt_length=app.config["PASSWORD_SALT_LENGTH"],
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_queue=app.config["PASSWORD_HASH_MAX_QUEUE"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+    )
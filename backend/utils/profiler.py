@@ -0,0 +1,247 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import random
+import sys
+import sysconfig
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import Response, current_app, g, request
+
+logger = logging.getLogger("itemhub.profiler")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_ARG = "_profile"
+
+
+# -----------------------------------------
+# Signed tokens (admin gate)
+# -----------------------------------------
+
+def _signature(secret: str, expires: int) -> str:
+    return hmac.new(secret.encode(), f"profile:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def make_token(secret: str, ttl_seconds: int) -> str:
+    """Token accepted in X-Profile (or ?_profile=) until it expires."""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(secret, expires)}"
+
+
+def token_is_valid(secret: str, token: str) -> bool:
+    expires, _, signature = token.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, int(expires)))
+
+
+# -----------------------------------------
+# Sampler
+# -----------------------------------------
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(BACKEND_DIR):
+        path = os.path.relpath(path, BACKEND_DIR)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(STDLIB_DIR):
+        path = os.path.relpath(path, STDLIB_DIR)
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+def collapse(frame) -> str:
+    """Root-to-leaf "a;b;c" stack, the format flamegraph.pl and speedscope read."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Statistical profiler for one thread: a helper thread records the target
+    thread's stack every `interval` seconds. Needs real OS threads, so it
+    sees nothing useful under the gevent worker class.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.started = time.perf_counter()
+        self.started_at = datetime.utcnow()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = collapse(frame)
+            if not self._stop.is_set():  # else the target is already waiting in stop()
+                self.stacks[stack] += 1
+
+    def stop(self) -> Counter:
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+            self.duration = time.perf_counter() - self.started
+        return self.stacks
+
+
+# -----------------------------------------
+# Storage
+# -----------------------------------------
+
+def to_collapsed(stacks) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+def store_profile(directory: str, keep: int, profile: dict) -> str:
+    """Writes the profile as JSON and deletes the oldest files beyond `keep`."""
+    os.makedirs(directory, exist_ok=True)
+    name = "{}-{}-{}.json".format(
+        datetime.utcnow().strftime("%Y%m%dT%H%M%S%f"), profile["endpoint"] or "unmatched", os.getpid()
+    )
+    path = os.path.join(directory, name)
+    with open(path + ".tmp", "w") as fh:
+        json.dump(profile, fh)
+    os.replace(path + ".tmp", path)  # readers never see a partial file
+
+    # names start with the timestamp, so lexical order is age order
+    stored = sorted(f for f in os.listdir(directory) if f.endswith(".json"))
+    for old in stored[:max(0, len(stored) - keep)]:
+        try:
+            os.remove(os.path.join(directory, old))
+        except FileNotFoundError:
+            pass  # another worker rotated it first
+    return name
+
+
+def load_profiles(directory: str, endpoint=None, since=None):
+    """Stored profiles, optionally for one endpoint / not older than `since` (datetime)."""
+    if not os.path.isdir(directory):
+        return
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as fh:
+                profile = json.load(fh)
+        except (OSError, ValueError):
+            continue  # rotated away or being written
+        if endpoint and profile.get("endpoint") != endpoint:
+            continue
+        if since and datetime.fromisoformat(profile["started_at"]) < since:
+            continue
+        yield profile
+
+
+# -----------------------------------------
+# Request hooks
+# -----------------------------------------
+
+def _requested_token():
+    return request.headers.get(PROFILE_HEADER) or request.args.get(PROFILE_QUERY_ARG)
+
+
+def _should_profile(config):
+    token = _requested_token()
+    if token and config["PROFILE_SECRET"]:
+        if token_is_valid(config["PROFILE_SECRET"], token):
+            return "requested"
+        logger.warning("invalid profile token", extra={"path": request.path})
+        return None
+
+    rate = config["PROFILE_SAMPLE_RATE"]
+    endpoints = config["PROFILE_ENDPOINTS"]
+    if rate and (not endpoints or request.endpoint in endpoints) and random.random() < rate:
+        return "sampled"
+    return None
+
+
+def _start_profiler():
+    config = current_app.config
+    trigger = _should_profile(config)
+    if trigger is None:
+        return
+    g._profiler = (trigger, StackSampler(threading.get_ident(), config["PROFILE_INTERVAL_MS"] / 1000).start())
+
+
+def _finish_profiler(response):
+    state = g.pop("_profiler", None)
+    if state is None:
+        return response
+    trigger, sampler = state
+    stacks = sampler.stop()
+    config = current_app.config
+
+    # inline only for signed requests: random samples never change the response
+    if trigger == "requested" and request.headers.get("X-Profile-Output") == "inline":
+        inline = Response(to_collapsed(stacks), mimetype="text/plain")
+        inline.headers["X-Profile-Original-Status"] = str(response.status_code)
+        return inline
+
+    profile = {
+        "endpoint": request.endpoint,
+        "method": request.method,
+        "path": request.path,
+        "query": {k: v for k, v in request.args.to_dict(flat=False).items() if k != PROFILE_QUERY_ARG},
+        "status": response.status_code,
+        "trigger": trigger,
+        "started_at": sampler.started_at.isoformat(),
+        "duration_ms": round(sampler.duration * 1000, 2),
+        "interval_ms": config["PROFILE_INTERVAL_MS"],
+        "samples": sum(stacks.values()),
+        "stacks": dict(stacks),
+    }
+    try:
+        name = store_profile(config["PROFILE_DIR"], config["PROFILE_KEEP"], profile)
+    except OSError:
+        logger.exception("could not store profile")
+        return response
+
+    logger.info("profile stored", extra={
+        "file": name, "endpoint": request.endpoint, "trigger": trigger,
+        "duration_ms": profile["duration_ms"], "samples": profile["samples"],
+    })
+    if trigger == "requested":
+        response.headers["X-Profile-Id"] = name
+    return response
+
+
+def _stop_abandoned_profiler(exc):
+    # after_request does not run when the response could not be built
+    state = g.pop("_profiler", None)
+    if state is not None:
+        state[1].stop()
+
+
+def init_profiler(app):
+    """
+    Profiles a request when it carries a valid signed token (PROFILE_SECRET,
+    see `flask profile-token`) or is picked at random (PROFILE_SAMPLE_RATE,
+    optionally only for PROFILE_ENDPOINTS). Profiles go to PROFILE_DIR;
+    `flask profile-report` merges them into flame-graph input.
+    """
+    if not (app.config["PROFILE_SECRET"] or app.config["PROFILE_SAMPLE_RATE"]):
+        return
+
+    app.before_request(_start_profiler)
+    app.after_request(_finish_profiler)
+    app.teardown_request(_stop_abandoned_profiler)
@@ -0,0 +1,163 @@
+import logging
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("itemhub.request_timing")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more SQL statements than it declared (QUERY_BUDGET_ENFORCE)."""
+
+
+class RequestTiming:
+    """Accumulators for the current request, kept in `g`."""
+
+    __slots__ = ("started", "queries", "db", "serialize")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+
+
+def _current():
+    if has_request_context():
+        return g.get("_request_timing")
+    return None
+
+
+# -----------------------------------------
+# Query budgets
+# -----------------------------------------
+
+def query_budget(max_queries: int):
+    """
+    Declares how many SQL statements a view may run per request.
+
+    Over budget the request logs a warning, or raises QueryBudgetExceeded
+    when QUERY_BUDGET_ENFORCE is on (so test runs fail loudly).
+    """
+    def decorator(view):
+        # an attribute, not a wrapper: decorators built on functools.wraps
+        # (jwt_required, ...) copy it to the function Flask registers
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def _budget_for(endpoint):
+    view = current_app.view_functions.get(endpoint)
+    budget = getattr(view, "query_budget", None)
+    return budget if budget is not None else (current_app.config["QUERY_BUDGET_DEFAULT"] or None)
+
+
+# -----------------------------------------
+# SQLAlchemy engine events (all engines: primary and replica)
+# -----------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current() is not None:
+        conn.info.setdefault("_timing_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _current()
+    stack = conn.info.get("_timing_started")
+    if timing is None or not stack:
+        return
+    timing.queries += 1
+    timing.db += time.perf_counter() - stack.pop()
+
+
+def _handle_error(context):
+    stack = context.connection.info.get("_timing_started") if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Default provider that adds the time spent encoding JSON to the request."""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            timing = _current()
+            if timing is not None:
+                timing.serialize += time.perf_counter() - started
+
+
+# -----------------------------------------
+# Request hooks
+# -----------------------------------------
+
+def _start_timing():
+    g._request_timing = RequestTiming()
+
+
+def _finish_timing(response):
+    timing = g.pop("_request_timing", None)
+    if timing is None:
+        return response
+
+    total = time.perf_counter() - timing.started
+    other = max(0.0, total - timing.db - timing.serialize)
+    response.headers["Server-Timing"] = (
+        f'db;dur={timing.db * 1000:.1f};desc="{timing.queries} queries", '
+        f"serialize;dur={timing.serialize * 1000:.1f}, "
+        f"other;dur={other * 1000:.1f}, "
+        f"total;dur={total * 1000:.1f}"
+    )
+
+    logger.info("request", extra={
+        "method": request.method,
+        "path": request.path,
+        "endpoint": request.endpoint,
+        "status": response.status_code,
+        "queries": timing.queries,
+        "db_ms": round(timing.db * 1000, 2),
+        "serialize_ms": round(timing.serialize * 1000, 2),
+        "other_ms": round(other * 1000, 2),
+        "total_ms": round(total * 1000, 2),
+    })
+
+    budget = _budget_for(request.endpoint)
+    if budget is not None and timing.queries > budget:
+        message = f"{request.endpoint} ran {timing.queries} queries (budget {budget})"
+        if current_app.config["QUERY_BUDGET_ENFORCE"]:
+            raise QueryBudgetExceeded(message)
+        logger.warning("query budget exceeded", extra={
+            "endpoint": request.endpoint, "queries": timing.queries, "budget": budget,
+        })
+
+    return response
+
+
+_listening = False
+
+
+def init_request_timing(app):
+    """
+    Enables the instrumentation when REQUEST_TIMING_ENABLED (or budget
+    enforcement) is on. Register before other after_request hooks so the
+    total includes them (Flask runs after_request in reverse order).
+    """
+    global _listening
+    if not (app.config["REQUEST_TIMING_ENABLED"] or app.config["QUERY_BUDGET_ENFORCE"]):
+        return
+
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _listening = True
+
+    app.json = TimedJSONProvider(app)
+    app.before_request(_start_timing)
+    app.after_request(_finish_timing)
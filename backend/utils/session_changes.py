@@ -0,0 +1,49 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# session.info key -> (collect, apply); see track_committed_changes
+_trackers = {}
+
+
+def committed_and_current(attr):
+    """(committed value, current value) of an attribute from its history."""
+    history = attr.history
+    if history.unchanged:
+        return history.unchanged[0], history.unchanged[0]
+    before = history.deleted[0] if history.deleted else None
+    return before, history.added[0] if history.added else before
+
+
+def track_committed_changes(key, apply, collect=None):
+    """
+    Feeds the ORM writes of this process to a per-process cache, only once
+    they are committed: after each flush `collect(session, pending)` returns
+    the changes accumulated under session.info[key] (None at first), after
+    the commit `apply(pending)` receives them, and a rollback drops them.
+    Without `collect`, writers fill session.info[key] themselves (mapper
+    events). Registering a key again replaces its callbacks.
+    """
+    _trackers[key] = (collect, apply)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session, flush_context):
+    for key, (collect, _) in list(_trackers.items()):
+        if collect is not None:
+            pending = collect(session, session.info.get(key))
+            if pending:
+                session.info[key] = pending
+
+
+@event.listens_for(Session, "after_commit")
+def _apply(session):
+    for key, (_, apply) in list(_trackers.items()):
+        pending = session.info.pop(key, None)
+        if pending:
+            apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session):
+    for key in _trackers:
+        session.info.pop(key, None)
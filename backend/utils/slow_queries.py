@@ -0,0 +1,222 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import has_request_context, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from utils.metrics import SLOW_QUERIES
+
+logger = logging.getLogger("itemhub.slow_query")
+
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_STATEMENT_CHARS = 4000
+MAX_PARAM_CHARS = 200
+MAX_PENDING_EXPLAINS = 20
+REDACTED_KEYS = ("password", "token", "secret")
+
+
+class _RateLimiter:
+    """Token bucket: `per_minute` records, refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(1, per_minute)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.suppressed = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """(allowed, records suppressed since the last allowed one)."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / 60)
+            self.updated = now
+            if self.tokens < 1:
+                self.suppressed += 1
+                return False, 0
+            self.tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+            return True, suppressed
+
+
+class _Settings:
+    threshold = None          # seconds
+    explain = False
+    explain_interval = 600.0  # seconds between plans of the same statement
+    limiter = None
+
+
+_settings = _Settings()
+_explained = {}               # query_id -> monotonic time of the last EXPLAIN
+_explain_engines = {}
+_executor = None
+_executor_pid = None
+_pending = 0
+_state_lock = threading.Lock()
+
+
+def _query_id(statement: str) -> str:
+    return hashlib.sha1(statement.encode()).hexdigest()[:12]
+
+
+def _origin():
+    if has_request_context():
+        return request.endpoint or request.path
+    return f"thread:{threading.current_thread().name}"
+
+
+def _is_row_list(parameters, executemany):
+    # batched "insertmanyvalues" INSERTs are executemany with one flat parameter set
+    return bool(
+        executemany and isinstance(parameters, (list, tuple)) and parameters
+        and isinstance(parameters[0], (list, tuple, dict))
+    )
+
+
+def _safe_parameters(parameters, executemany):
+    if _is_row_list(parameters, executemany):
+        parameters = parameters[0]  # the plan is the same for every row
+    if isinstance(parameters, dict):
+        return {
+            key: "***" if any(word in key.lower() for word in REDACTED_KEYS) else repr(value)[:MAX_PARAM_CHARS]
+            for key, value in parameters.items()
+        }
+    if isinstance(parameters, (list, tuple)):
+        return [repr(value)[:MAX_PARAM_CHARS] for value in parameters]
+    return parameters
+
+
+# -----------------------------------------
+# EXPLAIN (background thread, separate connection)
+# -----------------------------------------
+
+def _explain_engine(url):
+    # NullPool: EXPLAINs are rare and must not take connections from the request pool
+    key = str(url)
+    engine = _explain_engines.get(key)
+    if engine is None:
+        engine = _explain_engines.setdefault(key, create_engine(url, poolclass=NullPool))
+    return engine
+
+
+def _run_explain(url, dialect, statement, parameters, query_id, origin):
+    global _pending
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    try:
+        with _explain_engine(url).connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters).fetchall()
+        plan = "\n".join(str(row[-1]) for row in rows)
+        logger.warning("slow query plan", extra={"query_id": query_id, "origin": origin, "plan": plan})
+    except Exception:
+        logger.warning("could not explain slow query", exc_info=True, extra={"query_id": query_id})
+    finally:
+        with _state_lock:
+            _pending -= 1
+
+
+def _schedule_explain(conn, statement, parameters, executemany, query_id, origin):
+    global _executor, _executor_pid, _pending
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return
+    if conn.engine.dialect.name not in ("postgresql", "sqlite"):
+        return
+    if _is_row_list(parameters, executemany):
+        parameters = parameters[0]
+
+    now = time.monotonic()
+    with _state_lock:
+        last = _explained.get(query_id)
+        if last is not None and now - last < _settings.explain_interval:
+            return
+        if _pending >= MAX_PENDING_EXPLAINS:
+            return
+        if len(_explained) > 1000:
+            _explained.clear()
+        _explained[query_id] = now
+        _pending += 1
+        if _executor is None or _executor_pid != os.getpid():
+            # threads do not survive fork; build the pool in the process that uses it
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+            _executor_pid = os.getpid()
+            _pending = 1
+        executor = _executor
+
+    executor.submit(
+        _run_explain, conn.engine.url, conn.engine.dialect.name, statement, parameters, query_id, origin
+    )
+
+
+# -----------------------------------------
+# Engine events (all engines: primary and replica)
+# -----------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_slow_query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get("_slow_query_started")
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    if elapsed < _settings.threshold or statement.startswith(("EXPLAIN ", "EXPLAIN QUERY PLAN ")):
+        return
+
+    origin = _origin()
+    SLOW_QUERIES.labels((request.endpoint or "unmatched") if has_request_context() else "background").inc()
+    allowed, suppressed = _settings.limiter.allow()
+    if not allowed:
+        return
+
+    query_id = _query_id(statement)
+    logger.warning("slow query", extra={
+        "query_id": query_id,
+        "origin": origin,
+        "duration_ms": round(elapsed * 1000, 2),
+        "statement": statement[:MAX_STATEMENT_CHARS],
+        "parameters": _safe_parameters(parameters, executemany),
+        "executemany": executemany,
+        "suppressed": suppressed,
+    })
+    if _settings.explain:
+        _schedule_explain(conn, statement, parameters, executemany, query_id, origin)
+
+
+def _handle_error(context):
+    stack = context.connection.info.get("_slow_query_started") if context.connection is not None else None
+    if stack:
+        stack.pop()
+
+
+_listening = False
+
+
+def init_slow_query_log(app):
+    """
+    Logs statements slower than SLOW_QUERY_MS with their (redacted) bound
+    parameters and the endpoint or thread that ran them, at most
+    SLOW_QUERY_LOG_PER_MINUTE per process. With SLOW_QUERY_EXPLAIN the plan
+    (EXPLAIN, never ANALYZE) is captured by a background thread, once per
+    statement every SLOW_QUERY_EXPLAIN_INTERVAL seconds.
+    """
+    global _listening
+    config = app.config
+    if not config["SLOW_QUERY_MS"]:
+        return
+
+    _settings.threshold = config["SLOW_QUERY_MS"] / 1000
+    _settings.explain = config["SLOW_QUERY_EXPLAIN"]
+    _settings.explain_interval = config["SLOW_QUERY_EXPLAIN_INTERVAL"]
+    _settings.limiter = _RateLimiter(config["SLOW_QUERY_LOG_PER_MINUTE"])
+
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _listening = True
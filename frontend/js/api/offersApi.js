@@ -25,22 +25,42 @@ export async function getOfferById(offer_id) {
   return apiGet(`/offers/${offer_id}`);
 }
 
+/**
+ * Follows `next_cursor` until the last page of a keyset-paginated
+ * endpoint and returns the concatenated `data` arrays.
+ */
+async function fetchAllPages(endpoint, params = {}) {
+  const results = [];
+  let cursor = null;
+
+  do {
+    const query = { ...params, limit: 100 };
+    if (cursor) query.cursor = cursor;
+
+    const page = await apiGet(endpoint, query);
+    results.push(...(page?.data || []));
+    cursor = page?.next_cursor || null;
+  } while (cursor);
+
+  return results;
+}
+
 /**
  * GET /api/offers/item/<item_id>
- * Retrieve all offers for a given item (public)
+ * Retrieve all offers for a given item (public, walks every page)
  *
  * @param {number} item_id - Item ID to fetch offers for
  */
 export async function getOffersForItem(item_id) {
-  return apiGet(`/offers/item/${item_id}`);
+  return fetchAllPages(`/offers/item/${item_id}`);
 }
 
 /**
  * GET /api/offers/my
- * Retrieve all offers made by the logged-in user
+ * Retrieve all offers made by the logged-in user (walks every page)
  */
 export async function getMyOffers() {
-  return apiGet(`/offers/my`);
+  return fetchAllPages(`/offers/my`);
 }
 
 